@@ -9,3 +9,5 @@
 # except according to the terms contained in the LICENSE file.
 
 """This app implements core Distro Tracker functionality."""
+
+default_app_config = 'distro_tracker.core.apps.CoreConfig'
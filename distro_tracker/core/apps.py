@@ -0,0 +1,26 @@
+# Copyright 2016 The Distro Tracker Developers
+# See the COPYRIGHT file at the top-level directory of this distribution and
+# at http://deb.li/DTAuthors
+#
+# This file is part of Distro Tracker. It is subject to the license terms
+# in the LICENSE file found in the top-level directory of this
+# distribution and at http://deb.li/DTLicense. No part of Distro Tracker,
+# including this file, may be copied, modified, propagated, or distributed
+# except according to the terms contained in the LICENSE file.
+"""
+Application configuration of the core Distro Tracker app.
+"""
+from __future__ import unicode_literals
+
+from django.apps import AppConfig
+
+
+class CoreConfig(AppConfig):
+    name = 'distro_tracker.core'
+    verbose_name = 'Distro Tracker core'
+
+    def ready(self):
+        # Discover the package page panels of all installed apps once,
+        # instead of looking them up on each package page request.
+        from distro_tracker.core.panels import import_all_panels
+        import_all_panels()
@@ -0,0 +1,83 @@
+# Copyright 2016 The Distro Tracker Developers
+# See the COPYRIGHT file at the top-level directory of this distribution and
+# at http://deb.li/DTAuthors
+#
+# This file is part of Distro Tracker. It is subject to the license terms
+# in the LICENSE file found in the top-level directory of this
+# distribution and at http://deb.li/DTLicense. No part of Distro Tracker,
+# including this file, may be copied, modified, propagated, or distributed
+# except according to the terms contained in the LICENSE file.
+"""
+Implements a command to verify the stored main version of source packages.
+"""
+from __future__ import unicode_literals
+from optparse import make_option
+
+from django.core.management.base import BaseCommand
+
+from distro_tracker.core.models import SourcePackageName
+from distro_tracker.core.retrieve_data import update_main_source_versions
+
+
+class Command(BaseCommand):
+    """
+    A management command which compares the main version and main entry
+    stored on each source package with the values computed from its
+    repository entries.
+    """
+    help = ("Check the stored main version of source packages against the "
+            "computed one")
+    option_list = BaseCommand.option_list + (
+        make_option('--fix',
+                    action='store_true',
+                    dest='fix',
+                    default=False,
+                    help='Store the computed values of inconsistent packages'),
+    )
+
+    def handle(self, *args, **kwargs):
+        self.verbose = int(kwargs.get('verbosity', 1)) > 0
+        inconsistent = []
+        qs = SourcePackageName.objects.all()
+        qs = qs.select_related('main_source_entry__repository',
+                               'main_source_version')
+        for package in qs:
+            if not self.is_consistent(package):
+                inconsistent.append(package.name)
+
+        self.write("{} inconsistent source package(s)".format(
+            len(inconsistent)))
+        if inconsistent and kwargs['fix']:
+            update_main_source_versions(inconsistent)
+            self.write("Fixed {} source package(s)".format(len(inconsistent)))
+
+    def is_consistent(self, package):
+        """
+        Checks that the stored main version and main entry of the given
+        package match the ones computed from its repository entries.
+
+        Several entries of the same version can qualify as the main entry, so
+        the stored entry only needs to hold the main version and be in a
+        repository with the same default status as the computed one.
+        """
+        computed = package.compute_main_entry()
+        stored = package.main_source_entry
+        if computed is None:
+            consistent = stored is None and package.main_source_version is None
+        else:
+            consistent = (
+                stored is not None and
+                package.main_source_version_id == computed.source_package_id and
+                stored.source_package_id == computed.source_package_id and
+                stored.repository.default == computed.repository.default
+            )
+        if not consistent:
+            self.write("{}: stored {} but computed {}".format(
+                package.name,
+                package.main_source_version,
+                computed.source_package if computed else None))
+        return consistent
+
+    def write(self, message):
+        if self.verbose:
+            self.stdout.write(message)
@@ -0,0 +1,56 @@
+# Copyright 2016 The Distro Tracker Developers
+# See the COPYRIGHT file at the top-level directory of this distribution and
+# at http://deb.li/DTAuthors
+#
+# This file is part of Distro Tracker. It is subject to the license terms
+# in the LICENSE file found in the top-level directory of this
+# distribution and at http://deb.li/DTLicense. No part of Distro Tracker,
+# including this file, may be copied, modified, propagated, or distributed
+# except according to the terms contained in the LICENSE file.
+"""
+Implements a command which stores the rendered content of
+:class:`News <distro_tracker.core.models.News>` instances.
+"""
+from __future__ import unicode_literals
+from optparse import make_option
+
+from django.core.management.base import BaseCommand
+
+from distro_tracker.core.models import News
+
+
+class Command(BaseCommand):
+    """
+    A management command which renders the news which do not have a stored
+    rendering yet, or all news when ``--force`` is given.
+    """
+    help = "Store the rendered content of news"
+    option_list = BaseCommand.option_list + (
+        make_option('--force',
+                    action='store_true',
+                    dest='force',
+                    default=False,
+                    help='Render all news, not only the ones never rendered'),
+    )
+
+    def handle(self, *args, **kwargs):
+        self.verbose = int(kwargs.get('verbosity', 1)) > 0
+        news_ids = News.objects.all()
+        if not kwargs['force']:
+            news_ids = news_ids.filter(_rendered_content__isnull=True)
+        news_ids = list(news_ids.values_list('id', flat=True))
+
+        rendered = 0
+        # Fetch the news one at a time since their content can be big
+        for news_id in news_ids:
+            news = News.objects.filter(pk=news_id).first()
+            if news is None:
+                continue
+            news.update_rendered_content()
+            rendered += 1
+
+        self.write("Rendered {} news".format(rendered))
+
+    def write(self, message):
+        if self.verbose:
+            self.stdout.write(message)
@@ -0,0 +1,25 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_keywords_descriptions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='packagename',
+            name='main_source_entry',
+            field=models.ForeignKey(related_name='+', on_delete=django.db.models.deletion.SET_NULL, blank=True, to='core.SourcePackageRepositoryEntry', null=True),
+        ),
+        migrations.AddField(
+            model_name='packagename',
+            name='main_source_version',
+            field=models.ForeignKey(related_name='+', on_delete=django.db.models.deletion.SET_NULL, blank=True, to='core.SourcePackage', null=True),
+        ),
+    ]
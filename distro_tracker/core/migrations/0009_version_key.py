@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+
+from distro_tracker.core.utils.packages import version_sort_key
+
+
+def compute_version_keys(apps, schema_editor):
+    for model_name in ('SourcePackage', 'BinaryPackage'):
+        model = apps.get_model('core', model_name)
+        for pk, version in model.objects.values_list('pk', 'version'):
+            model.objects.filter(pk=pk).update(
+                version_key=version_sort_key(version))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_packagename_main_source_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='binarypackage',
+            name='version_key',
+            field=models.CharField(default='', max_length=512, editable=False, db_index=True),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='sourcepackage',
+            name='version_key',
+            field=models.CharField(default='', max_length=512, editable=False, db_index=True),
+            preserve_default=False,
+        ),
+        migrations.RunPython(compute_version_keys,
+                             migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_version_key'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='packagename',
+            name='last_modified',
+            field=models.DateTimeField(null=True, blank=True),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_packagename_last_modified'),
+    ]
+
+    operations = [
+        migrations.AlterIndexTogether(
+            name='actionitem',
+            index_together=set([('package', 'last_updated_timestamp')]),
+        ),
+        migrations.AlterIndexTogether(
+            name='news',
+            index_together=set([('package', 'datetime_created')]),
+        ),
+    ]
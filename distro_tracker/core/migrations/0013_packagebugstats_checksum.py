@@ -0,0 +1,20 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_news_rendered_content'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='packagebugstats',
+            name='checksum',
+            field=models.CharField(default='', max_length=32, blank=True),
+            preserve_default=False,
+        ),
+    ]
@@ -18,16 +18,23 @@ import hashlib
 import string
 import random
 import re
+import zlib
+import json
+import logging
 
-from debian.debian_support import AptPkgVersion
 from debian import changelog as debian_changelog
 from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
+from django.db import transaction
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
 from django.db.utils import IntegrityError
 from django.utils import six
 from django.utils import timezone
 from django.utils.encoding import python_2_unicode_compatible
 from django.utils.encoding import force_text
+from django.utils.encoding import force_bytes
 from django.utils.html import escape
 from django.utils.functional import cached_property
 from django.utils.safestring import mark_safe
@@ -40,13 +47,18 @@ from distro_tracker.core.utils import get_or_none
 from distro_tracker.core.utils import SpaceDelimitedTextField
 from distro_tracker.core.utils import verify_signature
 from distro_tracker.core.utils import distro_tracker_render_to_string
+from distro_tracker.core.utils import get_data_checksum
 from distro_tracker.core.utils.plugins import PluginRegistry
+from distro_tracker.core.utils.datastructures import SortedFileMap
 from distro_tracker.core.utils.email_messages import decode_header
 from distro_tracker.core.utils.email_messages import get_decoded_message_payload
 from distro_tracker.core.utils.email_messages import message_from_bytes
 from distro_tracker.core.utils.packages import package_hashdir
+from distro_tracker.core.utils.packages import version_sort_key
 from distro_tracker.core.utils.linkify import linkify
 
+logger = logging.getLogger(__name__)
+
 DISTRO_TRACKER_CONFIRMATION_EXPIRATION_DAYS = \
     settings.DISTRO_TRACKER_CONFIRMATION_EXPIRATION_DAYS
 
@@ -164,6 +176,20 @@ class PackageManager(models.Manager):
             self.type: True,
         })
 
+    def mark_modified(self, package_ids):
+        """
+        Sets the :attr:`last_modified <PackageName.last_modified>` timestamp
+        of the given packages to the current time.
+
+        :param package_ids: The ids of the packages whose data changed.
+        :type package_ids: iterable of ints
+        """
+        package_ids = list(set(package_ids))
+        timestamp = timezone.now()
+        for start in range(0, len(package_ids), 500):
+            self.filter(id__in=package_ids[start:start + 500]).update(
+                last_modified=timestamp)
+
     def exists_with_name(self, package_name):
         """
         :param package_name: The name of the package
@@ -248,6 +274,23 @@ class PackageName(models.Model):
     binary = models.BooleanField(default=False)
     pseudo = models.BooleanField(default=False)
 
+    #: The main :class:`SourcePackage` and
+    #: :class:`SourcePackageRepositoryEntry` of a source package, as returned
+    #: by :attr:`SourcePackageName.main_version` and
+    #: :attr:`SourcePackageName.main_entry`. They are maintained by
+    #: :class:`UpdateRepositoriesTask
+    #: <distro_tracker.core.retrieve_data.UpdateRepositoriesTask>`.
+    main_source_version = models.ForeignKey(
+        'SourcePackage', null=True, blank=True, on_delete=models.SET_NULL,
+        related_name='+')
+    main_source_entry = models.ForeignKey(
+        'SourcePackageRepositoryEntry', null=True, blank=True,
+        on_delete=models.SET_NULL, related_name='+')
+    #: The last time the data displayed on the package's page changed. It is
+    #: set with :meth:`PackageManager.mark_modified` and used to invalidate
+    #: cached content.
+    last_modified = models.DateTimeField(null=True, blank=True)
+
     subscriptions = models.ManyToManyField(EmailSettings,
                                            through='Subscription')
 
@@ -286,14 +329,15 @@ class PackageName(models.Model):
             to this :class:`PackageName` instance. ``None`` if the package
             has no action items of that type.
         :rtype: :class:`ActionItem` or ``None``
+
+        This runs a query on each call. Code looking up the items of many
+        packages should load them at once with
+        :meth:`ActionItemManager.get_items_by_package` instead.
         """
         if isinstance(action_item_type, ActionItemType):
             action_item_type = action_item_type.type_name
-        return next((
-            item
-            for item in self.action_items.all()
-            if item.item_type.type_name == action_item_type),
-            None)
+        return self.action_items.filter(
+            item_type__type_name=action_item_type).first()
 
     def delete(self, *args, **kwargs):
         """
@@ -375,8 +419,8 @@ class BinaryPackageName(PackageName):
         else:
             qs = self.sourcepackage_set.all()
 
-        if qs.exists():
-            source_package = max(qs, key=lambda x: AptPkgVersion(x.version))
+        source_package = qs.order_by('-version_key').first()
+        if source_package is not None:
             return source_package.source_package_name
         else:
             return None
@@ -403,6 +447,19 @@ class SourcePackageName(PackageName):
         It is defined as either the highest version found in the default
         repository, or if the package is not found in the default repository at
         all, the highest available version.
+
+        The stored :attr:`main_source_version
+        <PackageName.main_source_version>` is used when it is set, otherwise
+        the version is computed by :meth:`compute_main_version`.
+        """
+        if self.main_source_version_id is not None:
+            return self.main_source_version
+        return self.compute_main_version()
+
+    def compute_main_version(self):
+        """
+        Computes the :attr:`main_version` from the available source package
+        versions, regardless of the stored value.
         """
         default_repository_qs = self.source_package_versions.filter(
             repository_entries__repository__default=True)
@@ -411,11 +468,7 @@ class SourcePackageName(PackageName):
         else:
             qs = self.source_package_versions.all()
 
-        qs.select_related()
-        try:
-            return max(qs, key=lambda x: AptPkgVersion(x.version))
-        except ValueError:
-            return None
+        return qs.order_by('-version_key').first()
 
     @cached_property
     def main_entry(self):
@@ -424,6 +477,19 @@ class SourcePackageName(PackageName):
         package's entry in either the default repository (if the package is
         found there) or in the first repository (as defined by the repository
         order) which has the highest available package version.
+
+        The stored :attr:`main_source_entry <PackageName.main_source_entry>`
+        is used when it is set, otherwise the entry is computed by
+        :meth:`compute_main_entry`.
+        """
+        if self.main_source_entry_id is not None:
+            return self.main_source_entry
+        return self.compute_main_entry()
+
+    def compute_main_entry(self):
+        """
+        Computes the :attr:`main_entry` from the available repository
+        entries, regardless of the stored value.
         """
         default_repository_qs = SourcePackageRepositoryEntry.objects.filter(
             repository__default=True,
@@ -436,13 +502,7 @@ class SourcePackageName(PackageName):
                 source_package__source_package_name=self)
 
         qs = qs.select_related()
-        try:
-            return max(
-                qs,
-                key=lambda x: AptPkgVersion(x.source_package.version)
-            )
-        except ValueError:
-            return None
+        return qs.order_by('-source_package__version_key').first()
 
     @cached_property
     def repositories(self):
@@ -481,6 +541,40 @@ class SourcePackageName(PackageName):
         return ''
 
 
+#: The name of the file, in :data:`DISTRO_TRACKER_CACHE_DIRECTORY
+#: <distro_tracker.project.local_settings.DISTRO_TRACKER_CACHE_DIRECTORY>`,
+#: which maps package names to the package displayed for them on the web.
+#: See :func:`get_web_package_map`.
+WEB_PACKAGE_MAP_FILE_NAME = 'web-package-names'
+
+_web_package_map = None
+
+
+def get_web_package_map():
+    """
+    Returns the :class:`SortedFileMap
+    <distro_tracker.core.utils.datastructures.SortedFileMap>` mapping each
+    known package name to the type and the name of the package which
+    :func:`get_web_package` returns for it, as a space separated string.
+
+    The map is written by :func:`update_web_package_map
+    <distro_tracker.core.package_index.update_web_package_map>` and reopened
+    as soon as the file is replaced.
+
+    :returns: The map or ``None`` if it was not written yet.
+    """
+    global _web_package_map
+    path = os.path.join(
+        settings.DISTRO_TRACKER_CACHE_DIRECTORY, WEB_PACKAGE_MAP_FILE_NAME)
+    if (_web_package_map is None or _web_package_map.path != path or
+            not _web_package_map.is_current()):
+        try:
+            _web_package_map = SortedFileMap(path)
+        except (IOError, OSError):
+            _web_package_map = None
+    return _web_package_map
+
+
 def get_web_package(package_name):
     """
     Utility function mapping a package name to its most adequate Python
@@ -502,7 +596,26 @@ def get_web_package(package_name):
 
     :param package_name: The name for which a package should be found.
     :type package_name: string
+
+    When the :func:`web package map <get_web_package_map>` is available, the
+    package is found with a single query, or none at all if the map has no
+    package for the name. A name which became valid since the map was
+    written is thus only found once the map is written again. The database
+    is queried directly when the map file is missing.
     """
+    web_package_map = get_web_package_map()
+    if web_package_map is not None:
+        entry = web_package_map.get(package_name)
+        if entry is None:
+            return None
+        package_type, _, name = entry.partition(' ')
+        if not name:
+            return None
+        package = get_or_none(WEB_PACKAGE_MODELS[package_type], name=name)
+        if package is not None:
+            return package
+        # The map is outdated, fall back to the queries below.
+
     if SourcePackageName.objects.exists_with_name(package_name):
         return SourcePackageName.objects.get(name=package_name)
     elif PseudoPackageName.objects.exists_with_name(package_name):
@@ -521,6 +634,16 @@ def get_web_package(package_name):
     return None
 
 
+#: Maps the package types found in the web package map to the model of the
+#: package returned by :func:`get_web_package`.
+WEB_PACKAGE_MODELS = {
+    'source': SourcePackageName,
+    'pseudo': PseudoPackageName,
+    'binary': SourcePackageName,
+    'former': PackageName,
+}
+
+
 class SubscriptionManager(models.Manager):
     """
     A custom :class:`Manager <django.db.models.Manager>` for the
@@ -830,12 +953,7 @@ class Repository(models.Model):
         qs = self.source_entries.filter(
             source_package__source_package_name__name=package_name)
         qs = qs.select_related()
-        try:
-            return max(
-                qs,
-                key=lambda x: AptPkgVersion(x.source_package.version))
-        except ValueError:
-            return None
+        return qs.order_by('-source_package__version_key').first()
 
     def add_source_package(self, package, **kwargs):
         """
@@ -1073,6 +1191,11 @@ class SourcePackage(models.Model):
         SourcePackageName,
         related_name='source_package_versions')
     version = models.CharField(max_length=100)
+    #: A key sorting like :attr:`version` in dpkg, computed on save.
+    #: See :func:`version_sort_key
+    #: <distro_tracker.core.utils.packages.version_sort_key>`.
+    version_key = models.CharField(max_length=512, db_index=True,
+                                   editable=False)
 
     standards_version = models.CharField(max_length=550, blank=True)
     architectures = models.ManyToManyField(Architecture, blank=True)
@@ -1099,6 +1222,10 @@ class SourcePackage(models.Model):
         return '{pkg}, version {ver}'.format(
             pkg=self.source_package_name, ver=self.version)
 
+    def save(self, *args, **kwargs):
+        self.version_key = version_sort_key(self.version)
+        super(SourcePackage, self).save(*args, **kwargs)
+
     @cached_property
     def name(self):
         """
@@ -1198,6 +1325,9 @@ class BinaryPackage(models.Model):
         related_name='binary_package_versions'
     )
     version = models.CharField(max_length=100)
+    #: A key sorting like :attr:`version` in dpkg, computed on save.
+    version_key = models.CharField(max_length=512, db_index=True,
+                                   editable=False)
     source_package = models.ForeignKey(SourcePackage)
 
     short_description = models.CharField(max_length=300, blank=True)
@@ -1210,6 +1340,10 @@ class BinaryPackage(models.Model):
         return 'Binary package {pkg}, version {ver}'.format(
             pkg=self.binary_package_name, ver=self.version)
 
+    def save(self, *args, **kwargs):
+        self.version_key = version_sort_key(self.version)
+        super(BinaryPackage, self).save(*args, **kwargs)
+
     def update(self, **kwargs):
         """
         The method updates all of the instance attributes based on the keyword
@@ -1362,6 +1496,28 @@ class SourcePackageRepositoryEntry(models.Model):
         return self.source_package.version
 
 
+@receiver(post_delete, sender=SourcePackageRepositoryEntry)
+def _refresh_main_source_entry(sender, instance, **kwargs):
+    """
+    Recomputes the stored main version and entry of the source package whose
+    repository entry was deleted, either directly or along with its
+    repository, and marks the package as modified.
+
+    Deleting the entry only clears :attr:`PackageName.main_source_entry`,
+    leaving :attr:`PackageName.main_source_version` behind.
+    """
+    packages = SourcePackageName.objects.filter(
+        source_package_versions=instance.source_package_id)
+    for package in packages:
+        if package.main_source_entry_id is None and \
+                package.main_source_version_id == instance.source_package_id:
+            entry = package.compute_main_entry()
+            PackageName.objects.filter(pk=package.pk).update(
+                main_source_entry=entry,
+                main_source_version=entry.source_package if entry else None)
+        PackageName.objects.mark_modified([package.pk])
+
+
 def _extracted_source_file_upload_path(instance, filename):
     return '/'.join((
         'packages',
@@ -1392,6 +1548,56 @@ class ExtractedSourceFile(models.Model):
             extracted_file=self.extracted_file, package=self.source_package)
 
 
+class PackageExtractedInfoManager(models.Manager):
+    """
+    A custom :class:`Manager <django.db.models.Manager>` for the
+    :class:`PackageExtractedInfo` model.
+    """
+    #: The number of rows handled by a single query when reading or
+    #: creating extracted information in bulk.
+    BATCH_SIZE = 500
+
+    def update_values(self, key, values):
+        """
+        Stores the given values under the given key, touching only the rows
+        whose value is new or different from the one already stored.
+
+        Existing rows are read with one query per :attr:`BATCH_SIZE`
+        packages and missing rows are created with
+        :meth:`bulk_create <django.db.models.query.QuerySet.bulk_create>`.
+
+        :param key: The key of the extracted information.
+        :param values: A dict mapping a :class:`PackageName` id to the value
+            which should be stored for it.
+        :returns: The number of rows which were created or updated.
+        """
+        package_ids = list(values.keys())
+        existing = {}
+        for start in range(0, len(package_ids), self.BATCH_SIZE):
+            qs = self.filter(
+                key=key,
+                package_id__in=package_ids[start:start + self.BATCH_SIZE])
+            for info in qs:
+                existing[info.package_id] = info
+
+        to_create = []
+        updated = 0
+        for package_id, value in values.items():
+            info = existing.get(package_id)
+            if info is None:
+                to_create.append(
+                    self.model(package_id=package_id, key=key, value=value))
+            elif info.value != value:
+                info.value = value
+                info.save(update_fields=['value'])
+                updated += 1
+        self.bulk_create(to_create, batch_size=self.BATCH_SIZE)
+        PackageName.objects.mark_modified(
+            info.package_id for info in to_create)
+
+        return len(to_create) + updated
+
+
 @python_2_unicode_compatible
 class PackageExtractedInfo(models.Model):
     """
@@ -1403,6 +1609,12 @@ class PackageExtractedInfo(models.Model):
     key = models.CharField(max_length=50)
     value = JSONField()
 
+    objects = PackageExtractedInfoManager()
+
+    def save(self, *args, **kwargs):
+        super(PackageExtractedInfo, self).save(*args, **kwargs)
+        PackageName.objects.mark_modified([self.package_id])
+
     def __str__(self):
         return '{key}: {value} for package {package}'.format(
             key=self.key, value=self.value, package=self.package)
@@ -1578,9 +1790,15 @@ class News(models.Model):
     signed_by = models.ManyToManyField(
         ContributorName,
         related_name='signed_news_set')
+    #: The zlib compressed HTML rendering of the news. See
+    #: :attr:`rendered_content`.
+    _rendered_content = models.BinaryField(null=True, editable=False)
 
     objects = NewsManager()
 
+    class Meta:
+        index_together = ('package', 'datetime_created')
+
     def __str__(self):
         return self.title
 
@@ -1603,7 +1821,17 @@ class News(models.Model):
 
     def save(self, *args, **kwargs):
         super(News, self).save(*args, **kwargs)
+        PackageName.objects.mark_modified([self.package_id])
 
+        self._update_signed_by()
+        # The rendering includes the signers
+        try:
+            self.update_rendered_content()
+        except Exception:
+            # Do not lose the news, it is rendered again when displayed.
+            logger.exception("Failed to render news %s", self.pk)
+
+    def _update_signed_by(self):
         signers = verify_signature(self.get_signed_content())
         if signers is None:
             # No signature
@@ -1620,6 +1848,42 @@ class News(models.Model):
 
         self.signed_by = signed_by
 
+    def get_renderer(self):
+        """
+        :returns: The :class:`NewsRenderer` instance rendering the news,
+            according to its content type.
+        """
+        renderer_class = NewsRenderer.get_renderer_for_content_type(
+            self.content_type)
+        if renderer_class is None:
+            renderer_class = NewsRenderer.get_renderer_for_content_type(
+                'text/plain')
+        return renderer_class(self)
+
+    @property
+    def rendered_content(self):
+        """
+        The HTML rendering of the news content.
+
+        It is computed when the news is saved and stored compressed, so that
+        displaying the news does not need to read or parse its content.
+        News saved before the rendering was stored are rendered on first
+        access, or by the ``tracker_render_news`` management command.
+        """
+        if self._rendered_content is None:
+            self.update_rendered_content()
+        return mark_safe(
+            zlib.decompress(bytes(self._rendered_content)).decode('utf-8'))
+
+    def update_rendered_content(self):
+        """
+        Renders the news again and stores the result.
+        """
+        rendered = self.get_renderer().render_to_string()
+        self._rendered_content = zlib.compress(force_bytes(rendered))
+        News.objects.filter(pk=self.pk).update(
+            _rendered_content=self._rendered_content)
+
     def get_signed_content(self):
         return self.content
 
@@ -1851,6 +2115,94 @@ class EmailNewsRenderer(NewsRenderer):
         }
 
 
+class PackageDataManager(models.Manager):
+    """
+    A custom :class:`Manager <django.db.models.Manager>` for models storing
+    one JSON value per package in a ``package`` one-to-one field, along with
+    the checksum of the value in a ``checksum`` field.
+    """
+    #: The number of rows handled by a single query when updating the data.
+    BATCH_SIZE = 500
+
+    def __init__(self, data_field, *args, **kwargs):
+        """
+        :param data_field: The name of the field holding the data.
+        """
+        super(PackageDataManager, self).__init__(*args, **kwargs)
+        self.data_field = data_field
+
+    def update_data(self, data, package_model=None):
+        """
+        Makes the stored data match the given one.
+
+        The checksum of each value is compared to the stored one so that only
+        the rows of packages whose data changed are written. Rows of packages
+        missing from ``data`` are deleted and the packages whose data changed
+        are marked as modified.
+
+        :param data: A dict mapping package names to their data. Names of
+            unknown packages are ignored.
+        :param package_model: The model used to find the packages of new
+            rows. Defaults to :class:`PackageName`.
+        :returns: The number of created, updated and deleted rows.
+        :rtype: tuple
+        """
+        if package_model is None:
+            package_model = PackageName
+        batch_size = self.BATCH_SIZE
+        checksums = {
+            name: get_data_checksum(value)
+            for name, value in data.items()
+        }
+
+        with transaction.atomic():
+            existing = {
+                name: (pk, package_id, checksum)
+                for pk, package_id, name, checksum in self.values_list(
+                    'pk', 'package_id', 'package__name', 'checksum').iterator()
+            }
+
+            modified = []
+            for name, (pk, package_id, checksum) in existing.items():
+                if name not in data or checksums[name] == checksum:
+                    continue
+                self.filter(pk=pk).update(**{
+                    self.data_field: data[name],
+                    'checksum': checksums[name],
+                })
+                modified.append(package_id)
+            updated = len(modified)
+
+            obsolete = [
+                (pk, package_id)
+                for name, (pk, package_id, _) in existing.items()
+                if name not in data
+            ]
+            for start in range(0, len(obsolete), batch_size):
+                self.filter(pk__in=[
+                    pk for pk, _ in obsolete[start:start + batch_size]
+                ]).delete()
+            modified.extend(package_id for _, package_id in obsolete)
+
+            new_names = [name for name in data if name not in existing]
+            to_create = []
+            for start in range(0, len(new_names), batch_size):
+                packages = package_model.objects.filter(
+                    name__in=new_names[start:start + batch_size])
+                for name, package_id in packages.values_list('name', 'id'):
+                    to_create.append(self.model(**{
+                        'package_id': package_id,
+                        self.data_field: data[name],
+                        'checksum': checksums[name],
+                    }))
+            self.bulk_create(to_create, batch_size=batch_size)
+            modified.extend(row.package_id for row in to_create)
+
+            PackageName.objects.mark_modified(modified)
+
+        return len(to_create), updated, len(obsolete)
+
+
 @python_2_unicode_compatible
 class PackageBugStats(models.Model):
     """
@@ -1859,11 +2211,19 @@ class PackageBugStats(models.Model):
     """
     package = models.OneToOneField(PackageName, related_name='bug_stats')
     stats = JSONField(blank=True)
+    #: The checksum of :attr:`stats`, used to skip unchanged stats on update.
+    checksum = models.CharField(max_length=32, blank=True)
+
+    objects = PackageDataManager('stats')
 
     def __str__(self):
         return '{package} bug stats: {stats}'.format(
             package=self.package, stats=self.stats)
 
+    def save(self, *args, **kwargs):
+        super(PackageBugStats, self).save(*args, **kwargs)
+        PackageName.objects.mark_modified([self.package_id])
+
 
 @python_2_unicode_compatible
 class BinaryPackageBugStats(models.Model):
@@ -1929,6 +2289,9 @@ class ActionItemManager(models.Manager):
     A custom :class:`Manager <django.db.models.Manager>` for the
     :class:`ActionItem` model.
     """
+    #: The number of rows handled by a single query when reconciling items.
+    BATCH_SIZE = 500
+
     def delete_obsolete_items(self, item_types, non_obsolete_packages):
         """
         The method removes :class:`ActionItem` instances which have one of the
@@ -1946,8 +2309,164 @@ class ActionItemManager(models.Manager):
         else:
             qs = self.filter(item_type__in=item_types)
         qs = qs.exclude(package__name__in=non_obsolete_packages)
+        PackageName.objects.mark_modified(
+            qs.values_list('package_id', flat=True))
         qs.delete()
 
+    def get_items_by_package(self, packages, item_types=None):
+        """
+        Loads the action items of the given packages, along with their type,
+        with one query per :attr:`BATCH_SIZE` packages.
+
+        :param packages: The packages whose items are loaded.
+        :type packages: iterable of :class:`PackageName` instances or ids
+        :param item_types: When given, only the items of these types are
+            loaded.
+        :type item_types: list of :class:`ActionItemType` instances
+        :returns: A dict mapping the id of each given package to a dict
+            mapping type names to the item of that type. Packages without
+            items are mapped to an empty dict.
+        """
+        package_ids = list(set(
+            getattr(package, 'pk', package) for package in packages))
+        items = {package_id: {} for package_id in package_ids}
+        qs = self.select_related('item_type')
+        if item_types is not None:
+            qs = qs.filter(item_type__in=item_types)
+        for start in range(0, len(package_ids), self.BATCH_SIZE):
+            batch = package_ids[start:start + self.BATCH_SIZE]
+            for item in qs.filter(package_id__in=batch):
+                items[item.package_id][item.item_type.type_name] = item
+        return items
+
+    @staticmethod
+    def _normalize_extra_data(extra_data):
+        # Gives the extra data as it is read back from the database
+        return json.loads(json.dumps(extra_data, cls=DjangoJSONEncoder))
+
+    @classmethod
+    def is_unchanged(cls, item, state):
+        """
+        :returns: ``True`` if all the fields of the given item match the
+            given ``(severity, short_description, extra_data)`` tuple.
+        """
+        severity, short_description, extra_data = state
+        return (item.severity == severity and
+                item.short_description == short_description and
+                item.extra_data == cls._normalize_extra_data(extra_data))
+
+    @classmethod
+    def has_unchanged_extra_data(cls, item, state):
+        """
+        :returns: ``True`` if the extra data of the given item matches the one
+            of the given ``(severity, short_description, extra_data)`` tuple.
+        """
+        extra_data = state[2]
+        return item.extra_data == cls._normalize_extra_data(extra_data)
+
+    def reconcile(self, item_type, items, package_names=None,
+                  is_unchanged=None):
+        """
+        Makes the action items of the given type match the given state.
+
+        The existing items are read with a single query (one per
+        :attr:`BATCH_SIZE` packages when ``package_names`` is given). Missing
+        items are created and obsolete ones deleted with one query per
+        :attr:`BATCH_SIZE` items, while only the items which changed are
+        updated, with one query for all the items given the same state.
+
+        :param item_type: The type of the reconciled items.
+        :type item_type: :class:`ActionItemType`
+        :param items: A dict mapping package names to ``(severity,
+            short_description, extra_data)`` tuples describing the item which
+            the package should have. Names of unknown packages are ignored.
+        :param package_names: When given, only the items of these packages
+            and of the packages found in ``items`` are considered. Otherwise,
+            all items of the type belonging to packages missing from
+            ``items`` are deleted.
+        :type package_names: iterable of strings
+        :param is_unchanged: A function called with an existing item and the
+            tuple describing it, returning ``True`` when the item does not
+            need to be updated. Defaults to :meth:`is_unchanged`.
+        :returns: The number of created, updated and deleted items.
+        :rtype: tuple
+        """
+        batch_size = self.BATCH_SIZE
+        if is_unchanged is None:
+            is_unchanged = self.is_unchanged
+        qs = self.filter(item_type=item_type).select_related('package')
+        if package_names is None:
+            querysets = [qs]
+        else:
+            names = list(set(package_names) | set(items))
+            querysets = [
+                qs.filter(package__name__in=names[start:start + batch_size])
+                for start in range(0, len(names), batch_size)
+            ]
+
+        with transaction.atomic():
+            existing = {
+                item.package.name: item
+                for queryset in querysets
+                for item in queryset
+            }
+
+            # Changed items sharing the same new state are updated together
+            changed = {}
+            for name, item in existing.items():
+                if name not in items:
+                    continue
+                if is_unchanged(item, items[name]):
+                    continue
+                severity, short_description, extra_data = items[name]
+                key = (severity, short_description, json.dumps(
+                    extra_data, sort_keys=True, cls=DjangoJSONEncoder))
+                changed.setdefault(key, []).append(item)
+            modified = []
+            timestamp = timezone.now()
+            for group in changed.values():
+                severity, short_description, extra_data = \
+                    items[group[0].package.name]
+                for start in range(0, len(group), batch_size):
+                    self.filter(pk__in=[
+                        item.pk for item in group[start:start + batch_size]
+                    ]).update(
+                        severity=severity,
+                        short_description=short_description,
+                        extra_data=extra_data,
+                        last_updated_timestamp=timestamp)
+                modified.extend(item.package_id for item in group)
+            updated = len(modified)
+
+            obsolete = [
+                item for name, item in existing.items() if name not in items
+            ]
+            for start in range(0, len(obsolete), batch_size):
+                self.filter(pk__in=[
+                    item.pk for item in obsolete[start:start + batch_size]
+                ]).delete()
+            modified.extend(item.package_id for item in obsolete)
+
+            new_names = [name for name in items if name not in existing]
+            to_create = []
+            for start in range(0, len(new_names), batch_size):
+                packages = PackageName.objects.filter(
+                    name__in=new_names[start:start + batch_size])
+                for name, package_id in packages.values_list('name', 'id'):
+                    severity, short_description, extra_data = items[name]
+                    to_create.append(self.model(
+                        package_id=package_id,
+                        item_type=item_type,
+                        severity=severity,
+                        short_description=short_description,
+                        extra_data=extra_data))
+            self.bulk_create(to_create, batch_size=batch_size)
+            modified.extend(item.package_id for item in to_create)
+
+            PackageName.objects.mark_modified(modified)
+
+        return len(to_create), updated, len(obsolete)
+
 
 @python_2_unicode_compatible
 class ActionItem(models.Model):
@@ -1979,6 +2498,7 @@ class ActionItem(models.Model):
 
     class Meta:
         unique_together = ('package', 'item_type')
+        index_together = ('package', 'last_updated_timestamp')
 
     def __str__(self):
         return '{package} - {desc} ({severity})'.format(
@@ -1986,6 +2506,14 @@ class ActionItem(models.Model):
             desc=self.short_description,
             severity=self.get_severity_display())
 
+    def save(self, *args, **kwargs):
+        super(ActionItem, self).save(*args, **kwargs)
+        PackageName.objects.mark_modified([self.package_id])
+
+    def delete(self, *args, **kwargs):
+        PackageName.objects.mark_modified([self.package_id])
+        super(ActionItem, self).delete(*args, **kwargs)
+
     def get_absolute_url(self):
         return reverse('dtracker-action-item', kwargs={
             'item_pk': self.pk,
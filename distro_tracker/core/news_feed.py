@@ -11,18 +11,29 @@
 
 from __future__ import unicode_literals
 from django.conf import settings
+from django.core.cache import cache
 from django.http import Http404
 from django.contrib.syndication.views import Feed
+from django.views.decorators.http import condition
 from distro_tracker.core.models import get_web_package
 from distro_tracker.core.models import News
-from distro_tracker.core.models import NewsRenderer
 from distro_tracker.core.models import ActionItem
+from distro_tracker.core.views import package_etag, package_last_modified
 from itertools import chain
+import heapq
 
 
 class PackageNewsFeed(Feed):
     _DEFAULT_LIMIT = 30
 
+    def __call__(self, request, *args, **kwargs):
+        # Answer the polls of feed readers with a 304 response when the
+        # package did not change.
+        view = condition(etag_func=package_etag,
+                         last_modified_func=package_last_modified)(
+            super(PackageNewsFeed, self).__call__)
+        return view(request, *args, **kwargs)
+
     def get_object(self, request, package_name):
         package = get_web_package(package_name)
         if package is None:
@@ -48,17 +59,15 @@ class PackageNewsFeed(Feed):
         item_limit = getattr(settings, 'DISTRO_TRACKER_RSS_ITEM_LIMIT',
                              self._DEFAULT_LIMIT)
 
-        news = obj.news_set.all()
-        action_items = obj.action_items.all()
-
-        def item_key(item):
-            if isinstance(item, ActionItem):
-                return item.last_updated_timestamp
-            elif isinstance(item, News):
-                return item.datetime_created
+        # Only the most recent items of each kind can make it to the feed
+        news = obj.news_set.defer('_db_content')
+        news = news.order_by('-datetime_created')[:item_limit]
+        action_items = obj.action_items.select_related('item_type')
+        action_items = action_items.order_by(
+            '-last_updated_timestamp')[:item_limit]
 
         all_items = chain(news, action_items)
-        return sorted(all_items, key=item_key, reverse=True)[:item_limit]
+        return heapq.nlargest(item_limit, all_items, key=self.item_pubdate)
 
     def item_title(self, item):
         if isinstance(item, News):
@@ -67,15 +76,20 @@ class PackageNewsFeed(Feed):
             return item.short_description
 
     def item_description(self, item):
+        # Rendering a news can require reading its content from a file, the
+        # descriptions are cached until the item changes.
+        cache_key = 'dtracker-feed-{}:{}:{}'.format(
+            type(item).__name__, item.pk,
+            self.item_pubdate(item).strftime('%Y%m%d%H%M%S%f'))
+        description = cache.get(cache_key)
+        if description is None:
+            description = self._render_item_description(item)
+            cache.set(cache_key, description)
+        return description
+
+    def _render_item_description(self, item):
         if isinstance(item, News):
-            renderer_class = NewsRenderer.get_renderer_for_content_type(
-                item.content_type)
-            if renderer_class is None:
-                renderer_class = NewsRenderer.get_renderer_for_content_type(
-                    'text/plain')
-            renderer = renderer_class(item)
-
-            return renderer.render_to_string()
+            return item.rendered_content
         elif isinstance(item, ActionItem):
             return item.full_description
 
@@ -0,0 +1,257 @@
+# Copyright 2016 The Distro Tracker Developers
+# See the COPYRIGHT file at the top-level directory of this distribution and
+# at http://deb.li/DTAuthors
+#
+# This file is part of Distro Tracker. It is subject to the license terms
+# in the LICENSE file found in the top-level directory of this
+# distribution and at http://deb.li/DTLicense. No part of Distro Tracker,
+# including this file, may be copied, modified, propagated, or distributed
+# except according to the terms contained in the LICENSE file.
+"""
+Indexes of package names: an in-memory index used to answer autocomplete
+queries without scanning the package table and the file-backed map used to
+resolve the package displayed for a name on the web.
+"""
+from __future__ import unicode_literals
+
+from bisect import bisect_left, bisect_right
+import os
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from distro_tracker.core.models import PackageName
+from distro_tracker.core.models import News
+from distro_tracker.core.models import SourcePackage
+from distro_tracker.core.models import SourcePackageRepositoryEntry
+from distro_tracker.core.models import WEB_PACKAGE_MAP_FILE_NAME
+from distro_tracker.core.utils.datastructures import SortedFileMap
+
+#: The cache key holding the generation of the package names. Changing it
+#: tells all processes to reload their index.
+GENERATION_CACHE_KEY = 'dtracker-package-name-index-generation'
+#: The number of seconds between two checks of the generation.
+CHECK_INTERVAL = 60
+
+
+class NameList(object):
+    """
+    A sorted list of names which can be searched for names starting with or
+    containing a given string.
+
+    All names are stored in a single newline separated string, so that
+    substring searches are done by :meth:`str.find` instead of a Python loop.
+    """
+    def __init__(self, names):
+        self.names = sorted(set(names), key=lambda name: name.lower())
+        self._blob = '\n' + '\n'.join(name.lower() for name in self.names)
+        # The offset in the blob of the newline preceding each name
+        self._offsets = []
+        offset = 0
+        for name in self.names:
+            self._offsets.append(offset)
+            offset += len(name) + 1
+        self._lowered = [name.lower() for name in self.names]
+
+    def __len__(self):
+        return len(self.names)
+
+    def starting_with(self, prefix, limit):
+        """
+        :returns: The names starting with the given prefix, in alphabetical
+            order.
+        """
+        start = bisect_left(self._lowered, prefix)
+        end = bisect_right(self._lowered, prefix + '\uffff', start)
+        return self.names[start:min(end, start + limit)]
+
+    def containing(self, query, limit):
+        """
+        :returns: The names containing the given string, without starting
+            with it, in alphabetical order.
+        """
+        found = []
+        position = self._blob.find(query)
+        while position != -1 and len(found) < limit:
+            index = bisect_right(self._offsets, position) - 1
+            if position != self._offsets[index] + 1:
+                found.append(self.names[index])
+            # Continue after the end of the matching name
+            position = self._blob.find(
+                query, self._offsets[index] + len(self.names[index]) + 1)
+        return found
+
+
+class PackageNameIndex(object):
+    """
+    Indexes the names of packages for each of the package types the
+    autocomplete view can be asked for.
+    """
+    #: The package types which can be searched. ``None`` covers source and
+    #: pseudo packages.
+    PACKAGE_TYPES = (None, 'source', 'binary', 'pseudo')
+
+    def __init__(self, packages, generation=None):
+        """
+        :param packages: An iterable of ``(name, source, binary, pseudo)``
+            tuples.
+        :param generation: The generation of the package names the index was
+            built from.
+        """
+        names = {package_type: [] for package_type in self.PACKAGE_TYPES}
+        for name, source, binary, pseudo in packages:
+            if source or pseudo:
+                names[None].append(name)
+            if source:
+                names['source'].append(name)
+            if pseudo:
+                names['pseudo'].append(name)
+            if binary and not source:
+                names['binary'].append(name)
+        self.names = {
+            package_type: NameList(package_names)
+            for package_type, package_names in names.items()
+        }
+        self.generation = generation
+
+    @classmethod
+    def from_database(cls, generation=None):
+        return cls(
+            PackageName.objects.values_list(
+                'name', 'source', 'binary', 'pseudo').iterator(),
+            generation)
+
+    def search(self, query, package_type=None, limit=100):
+        """
+        Finds the package names containing the given query string.
+
+        :param package_type: One of ``'source'``, ``'binary'`` or
+            ``'pseudo'``. When ``None``, source and pseudo packages are
+            searched.
+        :returns: At most ``limit`` names. Names starting with the query
+            come first, each group being sorted alphabetically.
+        """
+        names = self.names.get(package_type, self.names[None])
+        query = query.lower()
+        if '\n' in query:
+            return []
+        found = names.starting_with(query, limit)
+        if len(found) < limit:
+            found.extend(names.containing(query, limit - len(found)))
+        return found
+
+
+_index = None
+_next_check = 0
+
+
+def get_package_name_index():
+    """
+    Returns the package name index of the process, building it on first use
+    and rebuilding it when :func:`invalidate_package_name_index` was called
+    in any process since it was built.
+
+    The generation stored in the cache is checked at most once every
+    :data:`CHECK_INTERVAL` seconds.
+    """
+    global _index, _next_check
+    now = time.time()
+    if _index is None or now >= _next_check:
+        generation = cache.get(GENERATION_CACHE_KEY)
+        if _index is None or _index.generation != generation:
+            _index = PackageNameIndex.from_database(generation)
+        _next_check = now + CHECK_INTERVAL
+    return _index
+
+
+def invalidate_package_name_index():
+    """
+    Makes all processes reload their package name index.
+    """
+    global _index
+    _index = None
+    cache.set(GENERATION_CACHE_KEY, uuid.uuid4().hex, None)
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def _drop_package_name_index(sender, instance, **kwargs):
+    """
+    Drops the index of the current process when a package is saved or
+    deleted. Other processes reload theirs once
+    :func:`invalidate_package_name_index` is called.
+    """
+    global _index
+    if isinstance(instance, PackageName):
+        _index = None
+
+
+def get_binaries_main_source_names():
+    """
+    Finds the main source package name of all binary packages at once,
+    following the rules of :meth:`BinaryPackageName.main_source_package_name
+    <distro_tracker.core.models.BinaryPackageName.main_source_package_name>`.
+
+    :returns: A dict mapping binary package names to source package names.
+    """
+    in_default_repository = set(
+        SourcePackageRepositoryEntry.objects.filter(
+            repository__default=True).values_list(
+                'source_package_id', flat=True))
+    sources = {
+        source_id: (name, version_key)
+        for source_id, name, version_key in SourcePackage.objects.values_list(
+            'id', 'source_package_name__name', 'version_key').iterator()
+    }
+
+    best = {}
+    links = SourcePackage.binary_packages.through.objects.values_list(
+        'binarypackagename__name', 'sourcepackage_id')
+    for binary_name, source_id in links.iterator():
+        source_name, version_key = sources[source_id]
+        rank = (source_id in in_default_repository, version_key)
+        if binary_name not in best or rank > best[binary_name][0]:
+            best[binary_name] = (rank, source_name)
+
+    return {
+        binary_name: source_name
+        for binary_name, (rank, source_name) in best.items()
+    }
+
+
+def update_web_package_map():
+    """
+    Writes the map of package names read by :func:`get_web_package_map
+    <distro_tracker.core.models.get_web_package_map>`.
+
+    Each name is mapped to one of ``source``, ``pseudo``, ``binary`` or
+    ``former`` and the name of the package returned by
+    :func:`get_web_package <distro_tracker.core.models.get_web_package>`.
+    Binary packages without a source package are mapped to their type only.
+    Names which would not give a package are left out.
+    """
+    main_source_names = get_binaries_main_source_names()
+    with_news = set(News.objects.values_list('package_id', flat=True))
+
+    def entries():
+        packages = PackageName.objects.values_list(
+            'id', 'name', 'source', 'pseudo', 'binary')
+        for package_id, name, source, pseudo, binary in packages.iterator():
+            if source:
+                yield name, 'source ' + name
+            elif pseudo:
+                yield name, 'pseudo ' + name
+            elif binary:
+                yield name, 'binary ' + main_source_names.get(name, '')
+            elif package_id in with_news:
+                yield name, 'former ' + name
+
+    directory = settings.DISTRO_TRACKER_CACHE_DIRECTORY
+    if not os.path.exists(directory):
+        os.makedirs(directory)
+    SortedFileMap.write(
+        os.path.join(directory, WEB_PACKAGE_MAP_FILE_NAME), entries())
@@ -10,13 +10,14 @@
 """Implements the core panels shown on package pages."""
 from __future__ import unicode_literals
 from django.conf import settings
+from django.core.cache import cache
 from django.utils.functional import cached_property
 from django.core.exceptions import ObjectDoesNotExist
 from django.utils import six
 from django.utils.safestring import mark_safe
 from distro_tracker.core.utils.plugins import PluginRegistry
 from distro_tracker.core.utils import get_vcs_name
-from distro_tracker.core.utils import get_or_none
+from distro_tracker.core.utils import distro_tracker_render_to_string
 from distro_tracker import vendor
 from distro_tracker.core.models import SourcePackageName
 from distro_tracker.core.models import PseudoPackageName
@@ -26,7 +27,6 @@ from distro_tracker.core.models import MailingList
 from distro_tracker.core.models import News
 from distro_tracker.core.models import BinaryPackageBugStats
 from distro_tracker.core.templatetags.distro_tracker_extras import octicon
-from debian.debian_support import AptPkgVersion
 from collections import defaultdict
 
 import importlib
@@ -34,6 +34,53 @@ import logging
 logger = logging.getLogger(__name__)
 
 
+class PackagePageData(object):
+    """
+    Loads the data of a package which is shared by the panels of its page, so
+    that it is only queried once for the whole page.
+    """
+    def __init__(self, package):
+        self.package = package
+
+    @cached_property
+    def extracted_info(self):
+        """
+        A dict mapping the keys of all the
+        :class:`PackageExtractedInfo
+        <distro_tracker.core.models.PackageExtractedInfo>` instances of the
+        package to their value.
+        """
+        return {
+            info.key: info.value
+            for info in PackageExtractedInfo.objects.filter(
+                package=self.package)
+        }
+
+    def get_extracted_info(self, key):
+        """
+        :returns: The value of the extracted information with the given key
+            or ``None`` if the package has no such information.
+        """
+        return self.extracted_info.get(key, None)
+
+    @cached_property
+    def binary_bug_stats(self):
+        """
+        A dict mapping the name of each binary package listed in the
+        ``binaries`` extracted information of the package to its stored bug
+        stats. Binary packages without bug stats are not included.
+        """
+        binaries = self.get_extracted_info('binaries') or []
+        names = [binary['name'] for binary in binaries]
+        if not names:
+            return {}
+        stats = BinaryPackageBugStats.objects.filter(package__name__in=names)
+        return {
+            stat.package.name: stat.stats
+            for stat in stats.select_related('package')
+        }
+
+
 class BasePanel(six.with_metaclass(PluginRegistry)):
 
     """
@@ -58,6 +105,14 @@ class BasePanel(six.with_metaclass(PluginRegistry)):
         self.package = package
         self.request = request
 
+    @cached_property
+    def page_data(self):
+        """
+        The :class:`PackagePageData` shared by the panels of the page.
+        :func:`get_panels_for_package` gives all panels the same instance.
+        """
+        return PackagePageData(self.package)
+
     @property
     def context(self):
         """
@@ -117,17 +172,62 @@ class BasePanel(six.with_metaclass(PluginRegistry)):
         """
         return True
 
+    #: Whether the rendered output of the panel can be cached until the
+    #: package's :attr:`last_modified
+    #: <distro_tracker.core.models.PackageName.last_modified>` timestamp
+    #: changes. Only panels whose output does not depend on the request and
+    #: whose data is covered by that timestamp should set this to ``True``.
+    cacheable = False
 
-def get_panels_for_package(package, request):
+
+class CachedPanel(object):
     """
-    A convenience method which accesses the :class:`BasePanel`'s list of
-    children and instantiates them for the given package.
+    Stands in for a panel whose rendered output was retrieved from the cache.
+    """
+    template_name = None
+    has_content = True
 
-    :returns: A dict mapping the page position to a list of Panels which should
-        be rendered in that position.
-    :rtype: dict
+    def __init__(self, position, panel_importance, html_output):
+        self.position = position
+        self.panel_importance = panel_importance
+        self.html_output = mark_safe(html_output)
+
+
+def _get_panel_cache_key(panel_class, package):
+    return 'dtracker-panel:{module}.{name}:{package_id}:{stamp}'.format(
+        module=panel_class.__module__,
+        name=panel_class.__name__,
+        package_id=package.id,
+        stamp=package.last_modified.strftime('%Y%m%d%H%M%S%f'))
+
+
+def _render_panel(panel):
+    """
+    Renders the given panel to a string, the same way the package page
+    renders it.
+    """
+    if panel.template_name:
+        return distro_tracker_render_to_string(panel.template_name, {
+            'panel': panel,
+            'package': panel.package,
+        })
+    return panel.html_output
+
+
+_panels_imported = False
+_panel_classes = ([], ())
+
+
+def import_all_panels():
+    """
+    Imports panels found in each installed app's ``tracker_panels`` module.
+
+    The lookup is only done the first time the function is called, subsequent
+    calls do nothing.
     """
-    # First import panels from installed apps.
+    global _panels_imported
+    if _panels_imported:
+        return
     for app in settings.INSTALLED_APPS:
         try:
             module_name = app + '.' + 'tracker_panels'
@@ -135,13 +235,83 @@ def get_panels_for_package(package, request):
         except ImportError:
             # The app does not implement package panels.
             pass
+    _panels_imported = True
+
+
+def get_panel_classes():
+    """
+    :returns: The registered :class:`BasePanel` subclasses.
+    :rtype: tuple
+
+    The tuple is built once and reused until a panel is registered or
+    unregistered.
+    """
+    global _panel_classes
+    registered, panel_classes = _panel_classes
+    if registered != BasePanel.plugins:
+        panel_classes = tuple(
+            panel_class
+            for panel_class in BasePanel.plugins
+            if panel_class is not BasePanel
+        )
+        _panel_classes = (list(BasePanel.plugins), panel_classes)
+    return panel_classes
+
+
+def get_panels_for_package(package, request):
+    """
+    A convenience method which accesses the :class:`BasePanel`'s list of
+    children and instantiates them for the given package.
+
+    The output of :attr:`cacheable <BasePanel.cacheable>` panels is cached
+    for :data:`DISTRO_TRACKER_PANELS_CACHE_TIMEOUT
+    <distro_tracker.project.local_settings.DISTRO_TRACKER_PANELS_CACHE_TIMEOUT>`
+    seconds, keyed by the package's last modification timestamp.
+
+    :returns: A dict mapping the page position to a list of Panels which should
+        be rendered in that position.
+    :rtype: dict
+    """
+    import_all_panels()
+
+    panel_classes = get_panel_classes()
+    page_data = PackagePageData(package)
+    timeout = getattr(settings, 'DISTRO_TRACKER_PANELS_CACHE_TIMEOUT', 0)
+    cache_keys = {}
+    if timeout and getattr(package, 'last_modified', None) is not None:
+        cache_keys = {
+            panel_class: _get_panel_cache_key(panel_class, package)
+            for panel_class in panel_classes
+            if panel_class.cacheable
+        }
+    cached_panels = cache.get_many(cache_keys.values()) if cache_keys else {}
 
     panels = defaultdict(lambda: [])
-    for panel_class in BasePanel.plugins:
-        if panel_class is not BasePanel:
-            panel = panel_class(package, request)
-            if panel.has_content:
-                panels[panel.position].append(panel)
+    new_cached_panels = {}
+    for panel_class in panel_classes:
+        cache_key = cache_keys.get(panel_class)
+        if cache_key in cached_panels:
+            position, panel_importance, html = cached_panels[cache_key]
+            if html is not None:
+                panels[position].append(
+                    CachedPanel(position, panel_importance, html))
+            continue
+
+        panel = panel_class(package, request)
+        panel.page_data = page_data
+        has_content = panel.has_content
+        if cache_key is not None:
+            html = _render_panel(panel) if has_content else None
+            new_cached_panels[cache_key] = (
+                panel.position, panel.panel_importance, html)
+            if has_content:
+                panel = CachedPanel(
+                    panel.position, panel.panel_importance, html)
+        if has_content:
+            panels[panel.position].append(panel)
+
+    if new_cached_panels:
+        cache.set_many(new_cached_panels, timeout)
 
     # Each columns' panels are sorted in the order of decreasing importance
     return dict({
@@ -174,6 +344,7 @@ class GeneralInformationPanel(BasePanel):
       <distro_tracker.vendor.skeleton.rules.get_uploader_extra>`
     """
     position = 'left'
+    cacheable = True
     title = 'general'
     template_name = 'core/panels/general.html'
 
@@ -228,14 +399,11 @@ class GeneralInformationPanel(BasePanel):
 
     @cached_property
     def context(self):
-        try:
-            info = PackageExtractedInfo.objects.get(
-                package=self.package, key='general')
-        except PackageExtractedInfo.DoesNotExist:
+        general = self.page_data.get_extracted_info('general')
+        if general is None:
             # There is no general info for the package
             return
 
-        general = info.value
         # Add source package URL
         url, implemented = vendor.call('get_package_information_site_url', **{
             'package_name': general['name'],
@@ -274,22 +442,18 @@ class VersionsInformationPanel(BasePanel):
       <distro_tracker.vendor.skeleton.rules.get_external_version_information_urls>`
     """
     position = 'left'
+    cacheable = True
     title = 'versions'
     template_name = 'core/panels/versions.html'
 
     @cached_property
     def context(self):
-        try:
-            info = PackageExtractedInfo.objects.get(
-                package=self.package, key='versions')
-        except PackageExtractedInfo.DoesNotExist:
-            info = None
+        version_info = self.page_data.get_extracted_info('versions')
 
         context = {}
 
-        if info:
-            version_info = info.value
-            package_name = info.package.name
+        if version_info:
+            package_name = self.package.name
             for item in version_info.get('version_list', ()):
                 url, implemented = vendor.call(
                     'get_package_information_site_url',
@@ -339,6 +503,7 @@ class VersionedLinks(BasePanel):
     position = 'left'
     title = 'versioned links'
     template_name = 'core/panels/versioned-links.html'
+    cacheable = True
 
     class LinkProvider(six.with_metaclass(PluginRegistry)):
 
@@ -436,10 +601,8 @@ class VersionedLinks(BasePanel):
             return
         # Make sure we display the versions in a version-number increasing
         # order
-        versions = sorted(
-            self.package.source_package_versions.all(),
-            key=lambda x: AptPkgVersion(x.version)
-        )
+        versions = self.package.source_package_versions.order_by(
+            'version_key')
 
         versioned_links = []
         for package in versions:
@@ -512,19 +675,18 @@ class BinariesInformationPanel(BasePanel):
       and the bug category.
     """
     position = 'left'
+    cacheable = True
     title = 'binaries'
     template_name = 'core/panels/binaries.html'
 
     def _get_binary_bug_stats(self, binary_name):
+        stats = self.page_data.binary_bug_stats.get(binary_name, None)
         bug_stats, implemented = vendor.call(
-            'get_binary_package_bug_stats', binary_name)
+            'get_binary_package_bug_stats', binary_name, stats=stats)
         if not implemented:
             # The vendor does not provide a custom list of bugs, so the default
             # is to display all bug info known for the package.
-            stats = get_or_none(
-                BinaryPackageBugStats, package__name=binary_name)
-            if stats is not None:
-                bug_stats = stats.stats
+            bug_stats = stats
 
         if bug_stats is None:
             return
@@ -550,13 +712,10 @@ class BinariesInformationPanel(BasePanel):
 
     @cached_property
     def context(self):
-        try:
-            info = PackageExtractedInfo.objects.get(
-                package=self.package, key='binaries')
-        except PackageExtractedInfo.DoesNotExist:
+        binaries = self.page_data.get_extracted_info('binaries')
+        if binaries is None:
             return
 
-        binaries = info.value
         for binary in binaries:
             # For each binary try to include known bug stats
             bug_stats = self._get_binary_bug_stats(binary['name'])
@@ -657,6 +816,13 @@ class PanelItemProvider(six.with_metaclass(PluginRegistry)):
     def __init__(self, package):
         self.package = package
 
+    @cached_property
+    def page_data(self):
+        """
+        The :class:`PackagePageData` of the panel displaying the items.
+        """
+        return PackagePageData(self.package)
+
     def get_panel_items(self):
         """
         The main method which needs to return a list of :class:`PanelItem`
@@ -711,6 +877,7 @@ class ListPanel(six.with_metaclass(ListPanelMeta, BasePanel)):
         items = []
         for panel_provider_class in panel_providers:
             panel_provider = panel_provider_class(self.package)
+            panel_provider.page_data = self.page_data
             try:
                 new_panel_items = panel_provider.get_panel_items()
             except:
@@ -747,6 +914,7 @@ class LinksPanel(ListPanel):
     """
     position = 'right'
     title = 'links'
+    cacheable = True
 
     class SimpleLinkItem(HtmlPanelItem):
 
@@ -800,10 +968,12 @@ class NewsPanel(BasePanel):
 
     template_name = 'core/panels/news.html'
     title = 'news'
+    cacheable = True
 
     @cached_property
     def context(self):
         news = News.objects.prefetch_related('signed_by')
+        news = news.defer('_db_content', '_rendered_content')
         news = news.filter(package=self.package).order_by('-datetime_created')
         news = list(news[:self.NEWS_LIMIT])
         more_pages = len(news) == self.NEWS_LIMIT
@@ -860,6 +1030,7 @@ class BugsPanel(BasePanel):
     position = 'right'
     title = 'bugs'
     panel_importance = 1
+    cacheable = True
     _default_template_name = 'core/panels/bugs.html'
 
     @property
@@ -916,6 +1087,7 @@ class ActionNeededPanel(BasePanel):
     template_name = 'core/panels/action-needed.html'
     panel_importance = 5
     position = 'center'
+    cacheable = True
 
     @cached_property
     def context(self):
@@ -942,6 +1114,7 @@ class DeadPackageWarningPanel(BasePanel):
     template_name = 'core/panels/package-is-gone.html'
     panel_importance = 9
     position = 'center'
+    cacheable = True
 
     @property
     def has_content(self):
@@ -26,6 +26,8 @@ from distro_tracker.core.utils.packages import (
     extract_information_from_packages_entry,
     AptCache)
 from distro_tracker.core.tasks import BaseTask
+from distro_tracker.core.package_index import invalidate_package_name_index
+from distro_tracker.core.package_index import update_web_package_map
 from distro_tracker.core.tasks import clear_all_events_on_exception
 from distro_tracker.core.models import SourcePackageName, Architecture
 from distro_tracker.accounts.models import UserEmail
@@ -83,6 +85,9 @@ def update_pseudo_package_list():
     for package_name in pseudo_packages:
         PseudoPackageName.objects.create(name=package_name)
 
+    invalidate_package_name_index()
+    update_web_package_map()
+
 
 def retrieve_repository_info(sources_list_entry):
     """
@@ -477,6 +482,33 @@ class UpdateRepositoriesTask(PackageUpdateTask):
             )
         )
 
+    def _update_main_source_versions(self, batch_size=500):
+        """
+        Refreshes the stored main version and main entry of all source
+        packages whose repository entries changed during this update and
+        marks those packages as modified.
+        """
+        package_names = list(set(
+            event.arguments['name']
+            for event in self._raised_events
+            if event.name in (
+                'new-source-package-version-in-repository',
+                'lost-source-package-version-in-repository',
+            )
+        ))
+        for start in range(0, len(package_names), batch_size):
+            PackageName.objects.mark_modified(
+                SourcePackageName.objects.filter(
+                    name__in=package_names[start:start + batch_size],
+                ).values_list('id', flat=True))
+
+        if self.force_update:
+            package_names = None
+        elif not package_names:
+            return
+        self.log("Updating the main version of source packages")
+        update_main_source_versions(package_names)
+
     def _update_repository_entries(self, all_entries_qs, event_generator=None):
         """
         Removes all repository entries which are no longer found in the
@@ -614,6 +646,7 @@ class UpdateRepositoriesTask(PackageUpdateTask):
             # When all repositories are handled, update which packages are
             # still found in at least one repository.
             self._remove_obsolete_packages()
+            self._update_main_source_versions()
 
     def update_packages_files(self, updated_packages):
         """
@@ -819,6 +852,97 @@ class UpdateRepositoriesTask(PackageUpdateTask):
         self.update_packages_files(updated_packages)
         self.log("Updating dependencies")
         self.update_dependencies()
+        invalidate_package_name_index()
+        update_web_package_map()
+
+
+def _get_main_source_entries(package_names=None):
+    """
+    Finds the main :class:`SourcePackageRepositoryEntry` of many source
+    packages at once.
+
+    The selection follows the same rules as
+    :meth:`SourcePackageName.compute_main_entry
+    <distro_tracker.core.models.SourcePackageName.compute_main_entry>` but it
+    is done in memory over a single ``values_list`` scan of the entries.
+
+    :param package_names: The names of the source packages to consider or
+        ``None`` to consider all of them.
+    :returns: A dict mapping a source package name id to an
+        ``(entry_id, source_package_id)`` pair describing its main entry.
+    """
+    qs = SourcePackageRepositoryEntry.objects.all()
+    if package_names is not None:
+        qs = qs.filter(
+            source_package__source_package_name__name__in=package_names)
+    qs = qs.values_list(
+        'id',
+        'source_package',
+        'source_package__source_package_name',
+        'source_package__version_key',
+        'repository__default')
+
+    best = {}
+    for entry_id, source_package_id, name_id, version_key, default in qs:
+        rank = (default, version_key)
+        if name_id not in best or rank > best[name_id][0]:
+            best[name_id] = (rank, (entry_id, source_package_id))
+
+    return {
+        name_id: main_entry
+        for name_id, (rank, main_entry) in best.items()
+    }
+
+
+def update_main_source_versions(package_names=None):
+    """
+    Updates the :attr:`main_source_version
+    <distro_tracker.core.models.PackageName.main_source_version>` and
+    :attr:`main_source_entry
+    <distro_tracker.core.models.PackageName.main_source_entry>` columns of
+    the given source packages. Only the rows whose value changed are
+    written.
+
+    :param package_names: The names of the source packages to update or
+        ``None`` to update all of them.
+    :returns: The number of updated source packages.
+    """
+    main_entries = _get_main_source_entries(package_names)
+
+    qs = SourcePackageName.objects.all()
+    if package_names is not None:
+        qs = qs.filter(name__in=package_names)
+    qs = qs.values_list('id', 'main_source_entry', 'main_source_version')
+
+    updated = 0
+    for name_id, entry_id, source_package_id in qs:
+        new_entry_id, new_source_package_id = \
+            main_entries.get(name_id, (None, None))
+        if (entry_id, source_package_id) == (new_entry_id,
+                                             new_source_package_id):
+            continue
+        PackageName.objects.filter(id=name_id).update(
+            main_source_entry=new_entry_id,
+            main_source_version=new_source_package_id)
+        updated += 1
+
+    return updated
+
+
+def _iter_source_entries(entry_ids, select_related=(), prefetch_related=(),
+                         batch_size=500):
+    """
+    Yields the :class:`SourcePackageRepositoryEntry` instances with the
+    given ids, loading them (and their related objects) in batches.
+    """
+    entry_ids = list(entry_ids)
+    for start in range(0, len(entry_ids), batch_size):
+        qs = SourcePackageRepositoryEntry.objects.filter(
+            id__in=entry_ids[start:start + batch_size])
+        qs = qs.select_related(*select_related)
+        qs = qs.prefetch_related(*prefetch_related)
+        for entry in qs:
+            yield entry
 
 
 class UpdatePackageGeneralInformation(PackageUpdateTask):
@@ -849,7 +973,11 @@ class UpdatePackageGeneralInformation(PackageUpdateTask):
                 uploader.to_dict()
                 for uploader in srcpkg.uploaders.all()
             ],
-            'architectures': map(str, srcpkg.architectures.order_by('name')),
+            # Sorted in Python so that prefetched architectures are reused
+            'architectures': sorted(
+                architecture.name
+                for architecture in srcpkg.architectures.all()
+            ),
             'standards_version': srcpkg.standards_version,
             'vcs': srcpkg.vcs,
         }
@@ -865,22 +993,27 @@ class UpdatePackageGeneralInformation(PackageUpdateTask):
         with transaction.atomic():
             if self.is_initial_task():
                 self.log("Updating general infos of all packages")
-                qs = SourcePackageName.objects.all()
+                package_names = None
             else:
                 self.log("Updating general infos of %d packages",
                          len(package_names))
-                qs = SourcePackageName.objects.filter(name__in=package_names)
-            for package in qs:
-                entry = package.main_entry
-                if entry is None:
-                    continue
-
-                general, _ = PackageExtractedInfo.objects.get_or_create(
-                    key='general',
-                    package=package
-                )
-                general.value = self._get_info_from_entry(entry)
-                general.save()
+            main_entries = _get_main_source_entries(package_names)
+            entries = _iter_source_entries(
+                [entry_id for entry_id, _ in main_entries.values()],
+                select_related=(
+                    'source_package__source_package_name',
+                    'source_package__maintainer__contributor_email',
+                ),
+                prefetch_related=(
+                    'source_package__uploaders__contributor_email',
+                    'source_package__architectures',
+                ))
+            values = {
+                entry.source_package.source_package_name_id:
+                    self._get_info_from_entry(entry)
+                for entry in entries
+            }
+            PackageExtractedInfo.objects.update_values('general', values)
 
 
 class UpdateVersionInformation(PackageUpdateTask):
@@ -895,36 +1028,116 @@ class UpdateVersionInformation(PackageUpdateTask):
     def __init__(self, *args, **kwargs):
         super(UpdateVersionInformation, self).__init__(*args, **kwargs)
         self.packages = set()
+        self._repositories = None
 
     def process_event(self, event):
         self.packages.add(event.arguments['name'])
 
-    def _extract_versions_for_package(self, package_name):
+    def _get_repositories(self):
         """
-        Returns a list where each element is a dictionary with the following
-        keys: repository_name, repository_shorthand, package_version.
+        Returns a dict mapping repository ids to :class:`Repository`
+        instances. The repositories and their flags are loaded only once per
+        run.
         """
+        if self._repositories is None:
+            self._repositories = {
+                repository.id: repository
+                for repository in Repository.objects.prefetch_related('flags')
+            }
+        return self._repositories
+
+    def _get_versions_info(self, package_entries):
+        """
+        Builds the versions information of a single package.
+
+        :param package_entries: A dict mapping a repository id to a
+            ``(version_key, version, directory)`` tuple describing the
+            highest version of the package found in that repository.
+        """
+        repositories = self._get_repositories()
+        repository_ids = sorted(
+            package_entries,
+            key=lambda repository_id: (
+                repositories[repository_id].position, repository_id))
+
         version_list = []
-        for repository in package_name.repositories:
+        for repository_id in repository_ids:
+            repository = repositories[repository_id]
             if repository.get_flags()['hidden']:
                 continue
-            entry = repository.get_source_package_entry(package_name)
             version_list.append({
                 'repository': {
-                    'name': entry.repository.name,
-                    'shorthand': entry.repository.shorthand,
-                    'codename': entry.repository.codename,
-                    'suite': entry.repository.suite,
-                    'id': entry.repository.id,
+                    'name': repository.name,
+                    'shorthand': repository.shorthand,
+                    'codename': repository.codename,
+                    'suite': repository.suite,
+                    'id': repository.id,
                 },
-                'version': entry.source_package.version,
+                'version': package_entries[repository_id][1],
             })
-        versions = {
+
+        # Same selection as SourcePackageName.main_entry: the default
+        # repository wins, then the highest version.
+        main_repository_id = max(
+            repository_ids,
+            key=lambda repository_id: (
+                repositories[repository_id].default,
+                package_entries[repository_id][0]))
+        main_repository = repositories[main_repository_id]
+        directory = package_entries[main_repository_id][2]
+        default_pool_url = None
+        if directory:
+            base_url = (main_repository.public_uri.rstrip('/') or
+                        main_repository.uri.rstrip('/'))
+            default_pool_url = base_url + '/' + directory
+
+        return {
             'version_list': version_list,
-            'default_pool_url': package_name.main_entry.directory_url,
+            'default_pool_url': default_pool_url,
         }
 
-        return versions
+    def _extract_versions(self, package_names=None):
+        """
+        Returns a dict mapping the id of each source package name to its
+        versions information.
+
+        All the source entries are read with a single ``values_list`` query
+        and the versions tables are built in memory.
+
+        :param package_names: The names of the packages to consider or
+            ``None`` to consider all packages.
+        """
+        qs = SourcePackageRepositoryEntry.objects.all()
+        if package_names is not None:
+            qs = qs.filter(
+                source_package__source_package_name__name__in=package_names)
+        qs = qs.values_list(
+            'source_package__source_package_name',
+            'repository',
+            'source_package__version_key',
+            'source_package__version',
+            'source_package__directory')
+
+        entries = {}
+        for name_id, repository_id, version_key, version, directory in qs:
+            package_entries = entries.setdefault(name_id, {})
+            current = package_entries.get(repository_id)
+            if current is None or version_key > current[0]:
+                package_entries[repository_id] = (
+                    version_key, version, directory)
+
+        return {
+            name_id: self._get_versions_info(package_entries)
+            for name_id, package_entries in entries.items()
+        }
+
+    def _extract_versions_for_package(self, package_name):
+        """
+        Returns a dict with the ``version_list`` and ``default_pool_url`` of
+        the given package. Each element of the version list is a dictionary
+        with the following keys: repository, version.
+        """
+        return self._extract_versions([package_name.name])[package_name.id]
 
     @clear_all_events_on_exception
     def execute(self):
@@ -935,17 +1148,12 @@ class UpdateVersionInformation(PackageUpdateTask):
         with transaction.atomic():
             if self.is_initial_task():
                 self.log("Updating versions tables of all packages")
-                qs = SourcePackageName.objects.all()
+                package_names = None
             else:
                 self.log("Updating versions tables of %d packages",
                          len(package_names))
-                qs = SourcePackageName.objects.filter(name__in=package_names)
-            for package in qs:
-                versions, _ = PackageExtractedInfo.objects.get_or_create(
-                    key='versions',
-                    package=package)
-                versions.value = self._extract_versions_for_package(package)
-                versions.save()
+            PackageExtractedInfo.objects.update_values(
+                'versions', self._extract_versions(package_names))
 
 
 class UpdateSourceToBinariesInformation(PackageUpdateTask):
@@ -966,26 +1174,53 @@ class UpdateSourceToBinariesInformation(PackageUpdateTask):
     def process_event(self, event):
         self.packages.add(event.arguments['name'])
 
-    def _get_all_binaries(self, package):
+    def _get_all_binaries(self, package_names=None, batch_size=500):
         """
-        Returns a list representing binary packages linked to the given
-        source package.
+        Returns a dict mapping the id of each source package name to a list
+        representing the binary packages linked to its main version.
+
+        The main entries are found with a single scan of the source entries
+        and their binaries are then read with one joined query per batch of
+        packages.
         """
-        repository = package.main_entry.repository
-        return [
-            {
-                'name': pkg.name,
-                'repository': {
-                    'name': repository.name,
-                    'shorthand': repository.shorthand,
-                    'suite': repository.suite,
-                    'codename': repository.codename,
-                    'id': repository.id,
-                },
+        repositories = {
+            repository.id: {
+                'name': repository.name,
+                'shorthand': repository.shorthand,
+                'suite': repository.suite,
+                'codename': repository.codename,
+                'id': repository.id,
             }
-            for pkg in package.main_version.binary_packages.all()
+            for repository in Repository.objects.all()
+        }
+        main_entry_ids = [
+            entry_id
+            for entry_id, _ in _get_main_source_entries(package_names).values()
         ]
 
+        binaries = {}
+        for start in range(0, len(main_entry_ids), batch_size):
+            qs = SourcePackageRepositoryEntry.objects.filter(
+                id__in=main_entry_ids[start:start + batch_size])
+            qs = qs.values_list(
+                'source_package__source_package_name',
+                'repository',
+                'source_package__binary_packages__name')
+            for name_id, repository_id, binary_name in qs:
+                package_binaries = binaries.setdefault(name_id, [])
+                # Main versions without any binary are still recorded
+                if binary_name is None:
+                    continue
+                package_binaries.append({
+                    'name': binary_name,
+                    'repository': repositories[repository_id],
+                })
+
+        for package_binaries in binaries.values():
+            package_binaries.sort(key=lambda binary: binary['name'])
+
+        return binaries
+
     @clear_all_events_on_exception
     def execute(self):
         package_names = set(
@@ -994,15 +1229,9 @@ class UpdateSourceToBinariesInformation(PackageUpdateTask):
         )
         with transaction.atomic():
             if self.is_initial_task():
-                qs = SourcePackageName.objects.all()
-            else:
-                qs = SourcePackageName.objects.filter(name__in=package_names)
-            for package in qs:
-                binaries, _ = PackageExtractedInfo.objects.get_or_create(
-                    key='binaries',
-                    package=package)
-                binaries.value = self._get_all_binaries(package)
-                binaries.save()
+                package_names = None
+            PackageExtractedInfo.objects.update_values(
+                'binaries', self._get_all_binaries(package_names))
 
 
 class UpdateTeamPackagesTask(BaseTask):
@@ -17,10 +17,14 @@ from __future__ import unicode_literals
 from distro_tracker.core.utils.plugins import PluginRegistry
 from distro_tracker.core.utils.datastructures import DAG
 from distro_tracker.core.models import RunningJob
+from distro_tracker.core.utils.http import HttpCache
+from distro_tracker.core.utils.http import get_resource_content
+from distro_tracker.core.utils.http import update_cached_resources
 from django.utils import six
 from django.conf import settings
 
 from collections import defaultdict
+from collections import OrderedDict
 import importlib
 import logging
 import sys
@@ -78,6 +82,10 @@ class BaseTask(six.with_metaclass(PluginRegistry)):
         self._raised_events = []
         #: A reference to the job to which this task belongs, if any
         self.job = job
+        #: The results of the update of the remote resources of the task
+        #: done by :func:`prefetch_remote_resources`, by URL. ``None`` until
+        #: they are fetched.
+        self.prefetched_resources = None
 
     def is_initial_task(self):
         """
@@ -96,6 +104,56 @@ class BaseTask(six.with_metaclass(PluginRegistry)):
         """
         pass
 
+    def get_remote_resources(self):
+        """
+        Returns the URLs of the remote resources the task reads through the
+        HTTP cache.
+
+        The expired resources are fetched concurrently, along with the ones
+        of the other tasks known to run, before the task is executed. The
+        task then gets them with :meth:`update_remote_resource` or
+        :meth:`get_remote_resource_content`, the latter reading the
+        resources which were still fresh from the cache.
+
+        The parameters of the task are already set when this method is
+        called.
+        """
+        return []
+
+    def update_remote_resource(self, url, force=False):
+        """
+        Updates the cached response for the given URL as done by
+        :meth:`HttpCache.update
+        <distro_tracker.core.utils.http.HttpCache.update>`, unless it was
+        already updated before the task started.
+
+        :returns: The HTTP response and a Boolean indicating whether the
+            cached value was updated.
+        """
+        result = (self.prefetched_resources or {}).pop(url, None)
+        if result is None:
+            cache = HttpCache(settings.DISTRO_TRACKER_CACHE_DIRECTORY)
+            return cache.update(url, force=force)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def get_remote_resource_content(self, url):
+        """
+        Returns the content of the resource found at the given URL as done
+        by :func:`get_resource_content
+        <distro_tracker.core.utils.http.get_resource_content>`, using the
+        response fetched before the task started when there is one.
+        """
+        if url not in (self.prefetched_resources or {}):
+            return get_resource_content(url)
+        try:
+            self.update_remote_resource(url)
+        except Exception:
+            return None
+        cache = HttpCache(settings.DISTRO_TRACKER_CACHE_DIRECTORY)
+        return cache.get_content(url)
+
     @property
     def raised_events(self):
         """
@@ -492,6 +550,12 @@ class Job(object):
             before it is executed.
         """
         self.job_state.additional_parameters = parameters
+        # The tasks which are known to run get their resources fetched at once
+        prefetch_remote_resources([
+            task for task in self.job_dag.all_tasks
+            if task.event_received and task.prefetched_resources is None and
+            task.task_name() not in self.job_state.processed_tasks
+        ], parameters)
         for task in self.job_dag.topsort_nodes():
             # This happens if the job was restarted. Skip such tasks since they
             # considered finish by this job. All its events will be propagated
@@ -513,6 +577,8 @@ class Job(object):
                     # Inject additional parameters, if any
                     if parameters:
                         task.set_parameters(parameters)
+                    if task.prefetched_resources is None:
+                        prefetch_remote_resources([task])
                     logger.info("Starting task {task}".format(
                         task=task.task_name()))
                     task.execute()
@@ -532,6 +598,42 @@ class Job(object):
         logger.info("Finished all tasks")
 
 
+def prefetch_remote_resources(tasks, parameters=None):
+    """
+    Fetches the remote resources of all the given tasks concurrently, as
+    given by their :meth:`BaseTask.get_remote_resources` method, and hands
+    the results over to the tasks.
+
+    A failure to get the resources of a task is logged and left for the task
+    to handle when it runs.
+
+    :param parameters: Parameters which are given to each task before its
+        resources are looked up.
+    """
+    resources = OrderedDict()
+    forced_urls = set()
+    for task in tasks:
+        try:
+            if parameters:
+                task.set_parameters(parameters)
+            urls = task.get_remote_resources()
+        except Exception:
+            logger.exception("Problem getting the resources of a task.")
+            continue
+        task.prefetched_resources = {}
+        for url in urls:
+            resources.setdefault(url, []).append(task)
+            if getattr(task, 'force_update', False):
+                forced_urls.add(url)
+
+    if not resources:
+        return
+    results = update_cached_resources(resources, forced_urls=forced_urls)
+    for url, result in results.items():
+        for task in resources[url]:
+            task.prefetched_resources[url] = result
+
+
 def clear_all_events_on_exception(func):
     """
     Decorator which makes sure that all events a task wanted to raise are
@@ -600,12 +702,23 @@ def run_all_tasks(parameters=None):
     """
     import_all_tasks()
 
+    jobs = []
     for task in BaseTask.plugins:
         if task is BaseTask:
             continue
         if not task.DEPENDS_ON_EVENTS:
-            logger.info("Starting task %s", task.task_name())
-            run_task(task)
+            jobs.append((task, Job(task)))
+
+    # The resources of all the initial tasks are fetched at once
+    prefetch_remote_resources([
+        job_task
+        for task, job in jobs
+        for job_task in job.job_dag.all_tasks
+        if job_task.event_received
+    ])
+    for task, job in jobs:
+        logger.info("Starting task %s", task.task_name())
+        job.run()
 
 
 def continue_task_from_state(job_state):
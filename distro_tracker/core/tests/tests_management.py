@@ -15,6 +15,7 @@ Tests for the Distro Tracker core management commands.
 """
 from __future__ import unicode_literals
 
+from django.utils.six import StringIO
 from django.utils.six.moves import mock
 from django.core.management import call_command
 
@@ -23,9 +24,12 @@ from distro_tracker.accounts.models import UserEmail
 from distro_tracker.core.models import EmailNews
 from distro_tracker.core.models import EmailSettings
 from distro_tracker.core.models import News
+from distro_tracker.core.models import PackageName
+from distro_tracker.core.models import Repository
 from distro_tracker.core.models import SourcePackageName
 from distro_tracker.core.models import Subscription
 from distro_tracker.core.utils import message_from_bytes
+from distro_tracker.test.utils import create_source_package
 from distro_tracker.test import SimpleTestCase
 from distro_tracker.test import TestCase
 
@@ -252,3 +256,79 @@ class FixDatabaseCommandTests(TestCase):
         self.user_email.emailsettings.delete()
         self.alt_user_email.emailsettings.delete()
         call_command('tracker_fix_database')
+
+
+class CheckMainVersionsCommandTests(TestCase):
+    """
+    Tests for the
+    :mod:`distro_tracker.core.management.commands.tracker_check_main_versions`
+    management command.
+    """
+    def setUp(self):
+        self.repository = Repository.objects.create(
+            name='repo', shorthand='repo', default=True)
+        self.package = create_source_package({
+            'name': 'dummy-package',
+            'version': '1.0.0',
+        })
+        self.entry = self.repository.add_source_package(self.package)
+
+    def run_command(self, **kwargs):
+        out = StringIO()
+        call_command('tracker_check_main_versions', stdout=out, **kwargs)
+        return out.getvalue()
+
+    def test_reports_missing_main_version(self):
+        output = self.run_command()
+
+        self.assertIn('1 inconsistent source package(s)', output)
+        self.assertIsNone(
+            PackageName.objects.get(name='dummy-package').main_source_entry)
+
+    def test_fixes_missing_main_version(self):
+        self.run_command(fix=True)
+
+        package = PackageName.objects.get(name='dummy-package')
+        self.assertEqual(self.entry, package.main_source_entry)
+        self.assertEqual(self.package, package.main_source_version)
+        self.assertIn('0 inconsistent source package(s)', self.run_command())
+
+    def test_reports_stale_main_version(self):
+        self.run_command(fix=True)
+        newer = create_source_package({
+            'name': 'dummy-package',
+            'version': '2.0.0',
+        })
+        self.repository.add_source_package(newer)
+
+        self.assertIn('1 inconsistent source package(s)', self.run_command())
+
+
+class RenderNewsCommandTests(TestCase):
+    """
+    Tests for the :mod:`distro_tracker.core.management.commands.\
+tracker_render_news` management command.
+    """
+    def setUp(self):
+        package = PackageName.objects.create(name='dummy-package')
+        self.news = News.objects.create(
+            title='title', content='Some content', package=package)
+        self.other_news = News.objects.create(
+            title='title', content='Other content', package=package)
+        News.objects.filter(pk=self.news.pk).update(_rendered_content=None)
+
+    def run_command(self, **kwargs):
+        out = StringIO()
+        call_command('tracker_render_news', stdout=out, **kwargs)
+        return out.getvalue()
+
+    def test_renders_news_without_rendered_content(self):
+        output = self.run_command()
+
+        self.assertIn('Rendered 1 news', output)
+        news = News.objects.get(pk=self.news.pk)
+        self.assertIsNotNone(news._rendered_content)
+        self.assertIn('Some content', news.rendered_content)
+
+    def test_force_renders_all_news(self):
+        self.assertIn('Rendered 2 news', self.run_command(force=True))
@@ -16,10 +16,12 @@ Tests for the Distro Tracker core module's models.
 from __future__ import unicode_literals
 from distro_tracker.test import TestCase
 from django.test.utils import override_settings
+from django.test.utils import CaptureQueriesContext
 from django.core.files.base import ContentFile
 from django.core.exceptions import ValidationError, ObjectDoesNotExist
 from django.core.urlresolvers import reverse
-from django.db import IntegrityError
+from django.db import connection, IntegrityError
+from django.utils.six.moves import mock
 from distro_tracker.core.models import Subscription, EmailSettings
 from distro_tracker.core.models import PackageName, BinaryPackageName
 from distro_tracker.core.models import BinaryPackage
@@ -34,6 +36,7 @@ from distro_tracker.core.models import Repository
 from distro_tracker.core.models import RepositoryFlag
 from distro_tracker.core.models import RepositoryRelation
 from distro_tracker.core.models import News
+from distro_tracker.core.models import PackageBugStats
 from distro_tracker.core.models import EmailNews
 from distro_tracker.core.models import EmailNewsRenderer
 from distro_tracker.core.models import SourcePackage
@@ -43,6 +46,7 @@ from distro_tracker.core.models import Team
 from distro_tracker.core.models import TeamMembership
 from distro_tracker.core.models import MembershipPackageSpecifics
 from distro_tracker.core.utils import message_from_bytes
+from distro_tracker.core.utils import get_data_checksum
 from distro_tracker.core.utils.email_messages import get_decoded_message_payload
 from distro_tracker.accounts.models import User, UserEmail
 from distro_tracker.test.utils import create_source_package
@@ -1442,6 +1446,41 @@ class NewsTests(TestCase):
         self.assertIsNone(news._db_content)
         self.assertEqual(news.content, expected_content)
 
+    def test_rendered_content_stored_on_create(self):
+        """
+        Tests that the rendering of a news is stored compressed when it is
+        created and that it is used without rendering the news again.
+        """
+        news = News.objects.create(
+            title='some title',
+            content='Some <content>',
+            package=self.package)
+
+        stored = News.objects.get(pk=news.pk)
+        self.assertIsNotNone(stored._rendered_content)
+        self.assertNotIn(b'Some &lt;content&gt;',
+                         bytes(stored._rendered_content))
+        with mock.patch.object(News, 'get_renderer') as mock_renderer:
+            rendered = stored.rendered_content
+        self.assertFalse(mock_renderer.called)
+        self.assertIn('Some &lt;content&gt;', rendered)
+
+    def test_rendered_content_missing(self):
+        """
+        Tests that a news without a stored rendering is rendered on first
+        access and that the rendering is then stored.
+        """
+        news = News.objects.create(
+            title='some title',
+            content='Some content',
+            package=self.package)
+        News.objects.filter(pk=news.pk).update(_rendered_content=None)
+        news = News.objects.get(pk=news.pk)
+
+        self.assertIn('Some content', news.rendered_content)
+        self.assertIsNotNone(
+            News.objects.get(pk=news.pk)._rendered_content)
+
     def test_create_email_news_signature(self):
         """
         Tests that the signature information is correctly extracted when
@@ -1707,6 +1746,293 @@ class ActionItemTests(TestCase):
         self.assertIn("data1, data2", action_item.full_description)
 
 
+class ActionItemManagerTests(TestCase):
+    """
+    Tests for the :class:`distro_tracker.core.models.ActionItemManager` and
+    the lookup of the action items of packages.
+    """
+    def setUp(self):
+        self.packages = [
+            PackageName.objects.create(name='pkg{}'.format(i))
+            for i in range(3)
+        ]
+        self.action_type = ActionItemType.objects.create(type_name='test-type')
+        self.other_type = ActionItemType.objects.create(type_name='other-type')
+
+    def create_item(self, package, item_type=None, **kwargs):
+        kwargs.setdefault('short_description', 'desc')
+        kwargs.setdefault('extra_data', {'count': 1})
+        return ActionItem.objects.create(
+            package=package, item_type=item_type or self.action_type,
+            **kwargs)
+
+    def get_items(self):
+        return {
+            item.package.name: item
+            for item in ActionItem.objects.filter(item_type=self.action_type)
+        }
+
+    def test_get_items_by_package(self):
+        """
+        Tests that the items of the given packages are mapped by type name,
+        using a single query.
+        """
+        first = self.create_item(self.packages[0])
+        other = self.create_item(self.packages[0], item_type=self.other_type)
+        self.create_item(self.packages[1])
+
+        with self.assertNumQueries(1):
+            items = ActionItem.objects.get_items_by_package(
+                [self.packages[0], self.packages[2].id])
+            self.assertEqual(
+                {'test-type': first, 'other-type': other},
+                items[self.packages[0].id])
+            self.assertEqual({}, items[self.packages[2].id])
+            self.assertNotIn(self.packages[1].id, items)
+
+    def test_get_items_by_package_item_types(self):
+        """
+        Tests that only the items of the given types are loaded when the
+        types are given.
+        """
+        item = self.create_item(self.packages[0])
+        self.create_item(self.packages[0], item_type=self.other_type)
+
+        items = ActionItem.objects.get_items_by_package(
+            [self.packages[0]], [self.action_type])
+
+        self.assertEqual({'test-type': item}, items[self.packages[0].id])
+
+    def test_get_action_item_for_type(self):
+        """
+        Tests that the item of a package is found from its type or the name
+        of its type.
+        """
+        item = self.create_item(self.packages[0])
+        self.create_item(self.packages[0], item_type=self.other_type)
+
+        package = self.packages[0]
+        self.assertEqual(item, package.get_action_item_for_type('test-type'))
+        self.assertEqual(
+            item, package.get_action_item_for_type(self.action_type))
+        self.assertIsNone(
+            self.packages[1].get_action_item_for_type('test-type'))
+
+    def test_reconcile_creates_items(self):
+        """
+        Tests that items are created for the packages without one, ignoring
+        unknown packages.
+        """
+        result = ActionItem.objects.reconcile(self.action_type, {
+            'pkg0': (ActionItem.SEVERITY_HIGH, 'desc', {'count': 1}),
+            'unknown': (ActionItem.SEVERITY_HIGH, 'desc', {'count': 1}),
+        })
+
+        self.assertEqual((1, 0, 0), result)
+        items = self.get_items()
+        self.assertEqual(['pkg0'], list(items))
+        self.assertEqual(ActionItem.SEVERITY_HIGH, items['pkg0'].severity)
+        self.assertEqual({'count': 1}, items['pkg0'].extra_data)
+
+    def test_reconcile_updates_changed_items_only(self):
+        """
+        Tests that only the items which differ from the given state are
+        updated.
+        """
+        unchanged = self.create_item(self.packages[0])
+        changed = self.create_item(self.packages[1])
+
+        result = ActionItem.objects.reconcile(self.action_type, {
+            'pkg0': (ActionItem.SEVERITY_NORMAL, 'desc', {'count': 1}),
+            'pkg1': (ActionItem.SEVERITY_NORMAL, 'new desc', {'count': 2}),
+        })
+
+        self.assertEqual((0, 1, 0), result)
+        items = self.get_items()
+        self.assertEqual(unchanged.last_updated_timestamp,
+                         items['pkg0'].last_updated_timestamp)
+        self.assertNotEqual(changed.last_updated_timestamp,
+                            items['pkg1'].last_updated_timestamp)
+        self.assertEqual('new desc', items['pkg1'].short_description)
+        self.assertEqual({'count': 2}, items['pkg1'].extra_data)
+
+    def test_reconcile_deletes_obsolete_items(self):
+        """
+        Tests that the items of packages missing from the state are deleted,
+        leaving the items of other types alone.
+        """
+        self.create_item(self.packages[0])
+        self.create_item(self.packages[1])
+        self.create_item(self.packages[1], item_type=self.other_type)
+
+        result = ActionItem.objects.reconcile(self.action_type, {
+            'pkg0': (ActionItem.SEVERITY_NORMAL, 'desc', {'count': 1}),
+        })
+
+        self.assertEqual((0, 0, 1), result)
+        self.assertEqual(['pkg0'], list(self.get_items()))
+        self.assertEqual(
+            1, ActionItem.objects.filter(item_type=self.other_type).count())
+
+    def test_reconcile_restricted_to_package_names(self):
+        """
+        Tests that only the items of the given packages are considered when
+        ``package_names`` is given.
+        """
+        self.create_item(self.packages[0])
+        self.create_item(self.packages[1])
+
+        result = ActionItem.objects.reconcile(self.action_type, {
+            'pkg2': (ActionItem.SEVERITY_NORMAL, 'desc', {'count': 1}),
+        }, package_names=['pkg1'])
+
+        self.assertEqual((1, 0, 1), result)
+        self.assertEqual(['pkg0', 'pkg2'], sorted(self.get_items()))
+
+    def test_reconcile_custom_is_unchanged(self):
+        """
+        Tests that the given ``is_unchanged`` function decides which items
+        are updated.
+        """
+        self.create_item(self.packages[0])
+
+        result = ActionItem.objects.reconcile(self.action_type, {
+            'pkg0': (ActionItem.SEVERITY_HIGH, 'new desc', {'count': 1}),
+        }, is_unchanged=ActionItem.objects.has_unchanged_extra_data)
+
+        self.assertEqual((0, 0, 0), result)
+        self.assertEqual('desc', self.get_items()['pkg0'].short_description)
+
+    def test_reconcile_groups_updates(self):
+        """
+        Tests that the items given the same new state are updated with a
+        single query.
+        """
+        for package in self.packages:
+            self.create_item(package)
+        state = (ActionItem.SEVERITY_HIGH, 'new desc', {'count': 2})
+
+        with CaptureQueriesContext(connection) as queries:
+            result = ActionItem.objects.reconcile(self.action_type, {
+                package.name: state for package in self.packages
+            })
+
+        self.assertEqual((0, 3, 0), result)
+        updates = [
+            query for query in queries.captured_queries
+            if 'UPDATE "{}"'.format(ActionItem._meta.db_table) in query['sql']
+        ]
+        self.assertEqual(1, len(updates))
+        for item in self.get_items().values():
+            self.assertEqual('new desc', item.short_description)
+
+    def test_reconcile_marks_packages_modified(self):
+        """
+        Tests that the packages whose items changed are marked as modified.
+        """
+        self.create_item(self.packages[0])
+        self.create_item(self.packages[1])
+        PackageName.objects.update(last_modified=None)
+
+        ActionItem.objects.reconcile(self.action_type, {
+            'pkg1': (ActionItem.SEVERITY_NORMAL, 'desc', {'count': 1}),
+            'pkg2': (ActionItem.SEVERITY_NORMAL, 'desc', {'count': 1}),
+        })
+
+        modified = PackageName.objects.exclude(last_modified=None)
+        self.assertEqual(['pkg0', 'pkg2'],
+                         sorted(modified.values_list('name', flat=True)))
+
+
+class PackageDataManagerTests(TestCase):
+    """
+    Tests for the :class:`distro_tracker.core.models.PackageDataManager`
+    manager, through the :class:`PackageBugStats` model.
+    """
+    def setUp(self):
+        self.packages = [
+            PackageName.objects.create(name='pkg{}'.format(i))
+            for i in range(3)
+        ]
+
+    def get_stats(self):
+        return {
+            stats.package.name: stats
+            for stats in PackageBugStats.objects.all()
+        }
+
+    def test_update_data_creates_rows(self):
+        """
+        Tests that rows are created for known packages, with the checksum of
+        their data.
+        """
+        data = {'pkg0': [{'category_name': 'rc', 'bug_count': 1}]}
+
+        result = PackageBugStats.objects.update_data(
+            dict(data, unknown=[]))
+
+        self.assertEqual((1, 0, 0), result)
+        stats = self.get_stats()
+        self.assertEqual(['pkg0'], list(stats))
+        self.assertEqual(data['pkg0'], stats['pkg0'].stats)
+        self.assertEqual(get_data_checksum(data['pkg0']),
+                         stats['pkg0'].checksum)
+
+    def test_update_data_changed_rows_only(self):
+        """
+        Tests that only the rows whose data changed are written and that only
+        their packages are marked as modified.
+        """
+        PackageBugStats.objects.update_data({'pkg0': [1], 'pkg1': [1]})
+        PackageName.objects.update(last_modified=None)
+
+        result = PackageBugStats.objects.update_data(
+            {'pkg0': [1], 'pkg1': [2]})
+
+        self.assertEqual((0, 1, 0), result)
+        stats = self.get_stats()
+        self.assertEqual([1], stats['pkg0'].stats)
+        self.assertEqual([2], stats['pkg1'].stats)
+        self.assertEqual(get_data_checksum([2]), stats['pkg1'].checksum)
+        modified = PackageName.objects.exclude(last_modified=None)
+        self.assertEqual(['pkg1'],
+                         list(modified.values_list('name', flat=True)))
+
+    def test_update_data_missing_checksum(self):
+        """
+        Tests that rows stored without a checksum are updated.
+        """
+        PackageBugStats.objects.create(package=self.packages[0], stats=[1])
+
+        result = PackageBugStats.objects.update_data({'pkg0': [1]})
+
+        self.assertEqual((0, 1, 0), result)
+        self.assertEqual(get_data_checksum([1]),
+                         self.get_stats()['pkg0'].checksum)
+
+    def test_update_data_deletes_rows(self):
+        """
+        Tests that the rows of packages missing from the data are deleted.
+        """
+        PackageBugStats.objects.update_data({'pkg0': [1], 'pkg1': [1]})
+
+        result = PackageBugStats.objects.update_data({'pkg1': [1]})
+
+        self.assertEqual((0, 0, 1), result)
+        self.assertEqual(['pkg1'], list(self.get_stats()))
+
+    def test_update_data_package_model(self):
+        """
+        Tests that new rows are only created for packages of the given model.
+        """
+        SourcePackageName.objects.create(name='source')
+
+        PackageBugStats.objects.update_data(
+            {'pkg0': [1], 'source': [1]}, package_model=SourcePackageName)
+
+        self.assertEqual(['source'], list(self.get_stats()))
+
+
 class TeamTests(TestCase):
     """
     Tests for the :class:`Team <distro_tracker.core.models.Team>` model.
@@ -16,8 +16,12 @@ Tests for the :mod:`distro_tracker.core.news_feed` module.
 from __future__ import unicode_literals
 
 from datetime import datetime
+from datetime import timedelta
 
+from django.core.cache import cache
 from django.core.urlresolvers import reverse
+from django.utils import timezone
+from django.utils.six.moves import mock
 from xml.dom import minidom
 
 from distro_tracker.test import TestCase
@@ -27,6 +31,7 @@ from distro_tracker.core.models import ActionItem
 from distro_tracker.core.models import News
 from distro_tracker.core.models import EmailNews
 from distro_tracker.core.utils import message_from_bytes
+from distro_tracker.core.news_feed import PackageNewsFeed
 
 
 class NewsFeedTests(TestCase):
@@ -327,6 +332,55 @@ class NewsFeedTests(TestCase):
             dom_items = self.get_all_dom_items(response.content)
             self.assertEqual(item_limit, len(dom_items))
 
+    def test_most_recent_items_selected(self):
+        """
+        Tests that only the most recent news and action items are included,
+        with a number of queries which does not depend on the number of
+        items of the package.
+        """
+        now = timezone.now()
+        for i in range(5):
+            news = News.objects.create(
+                title='News {}'.format(i), content='Content',
+                package=self.package)
+            News.objects.filter(pk=news.pk).update(
+                datetime_created=now - timedelta(days=10 - i))
+        item_type = ActionItemType.objects.create(
+            type_name='item-type',
+            full_description_template='action-item-test.html')
+        item = ActionItem.objects.create(
+            item_type=item_type,
+            package=self.package,
+            short_description="Action item")
+        ActionItem.objects.filter(pk=item.pk).update(
+            last_updated_timestamp=now - timedelta(days=6, hours=12))
+        feed = PackageNewsFeed()
+
+        with self.settings(DISTRO_TRACKER_RSS_ITEM_LIMIT=3):
+            with self.assertNumQueries(2):
+                items = feed.items(self.package)
+
+        self.assertEqual(
+            ['News 4', 'Action item', 'News 3'],
+            [feed.item_title(item) for item in items])
+
+    def test_item_description_cached(self):
+        """
+        Tests that the description of an item is only rendered once.
+        """
+        cache.clear()
+        news = News.objects.create(
+            title='Some title', content='Some content', package=self.package)
+        feed = PackageNewsFeed()
+
+        with mock.patch.object(PackageNewsFeed, '_render_item_description',
+                               return_value='Some content') as mock_render:
+            feed.item_description(news)
+            description = feed.item_description(news)
+
+        self.assertEqual('Some content', description)
+        self.assertEqual(1, mock_render.call_count)
+
     def test_legacy_redirect(self):
         legacy_url = '/{h}/{pkg}/news.rss20.xml'.format(
             h=self.package.name[0],
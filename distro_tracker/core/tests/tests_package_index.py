@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2016 The Distro Tracker Developers
+# See the COPYRIGHT file at the top-level directory of this distribution and
+# at http://deb.li/DTAuthors
+#
+# This file is part of Distro Tracker. It is subject to the license terms
+# in the LICENSE file found in the top-level directory of this
+# distribution and at http://deb.li/DTLicense. No part of Distro Tracker,
+# including this file, may be copied, modified, propagated, or distributed
+# except according to the terms contained in the LICENSE file.
+
+"""
+Tests for the :mod:`distro_tracker.core.package_index` module.
+"""
+from __future__ import unicode_literals
+
+from django.core.cache import cache
+
+from distro_tracker.test import SimpleTestCase, TestCase
+from distro_tracker.core.models import BinaryPackageName
+from distro_tracker.core.models import PackageName
+from distro_tracker.core.models import PseudoPackageName
+from distro_tracker.core.models import Repository
+from distro_tracker.core.models import SourcePackage
+from distro_tracker.core.models import SourcePackageName
+from distro_tracker.core.models import get_web_package
+from distro_tracker.core.models import get_web_package_map
+from distro_tracker.core.package_index import GENERATION_CACHE_KEY
+from distro_tracker.core.package_index import NameList
+from distro_tracker.core.package_index import PackageNameIndex
+from distro_tracker.core.package_index import get_package_name_index
+from distro_tracker.core.package_index import invalidate_package_name_index
+from distro_tracker.core.package_index import update_web_package_map
+
+
+class NameListTests(SimpleTestCase):
+    def setUp(self):
+        self.names = NameList([
+            'libfoo', 'foo', 'foo-dev', 'barfoo', 'bar', 'Food', 'foo'])
+
+    def test_starting_with(self):
+        """
+        Tests finding the names starting with a prefix.
+        """
+        self.assertEqual(
+            ['foo', 'foo-dev', 'Food'], self.names.starting_with('foo', 10))
+        self.assertEqual(['foo'], self.names.starting_with('foo', 1))
+        self.assertEqual([], self.names.starting_with('baz', 10))
+
+    def test_containing(self):
+        """
+        Tests finding the names containing a string without starting with it.
+        """
+        self.assertEqual(
+            ['barfoo', 'libfoo'], self.names.containing('foo', 10))
+        self.assertEqual(['barfoo'], self.names.containing('foo', 1))
+        self.assertEqual([], self.names.containing('bar', 10))
+
+    def test_containing_matches_each_name_once(self):
+        """
+        Tests that a name containing the string several times is only
+        returned once.
+        """
+        names = NameList(['aaaa', 'baaa'])
+
+        self.assertEqual(['baaa'], names.containing('a', 10))
+
+
+class PackageNameIndexTests(SimpleTestCase):
+    def setUp(self):
+        self.index = PackageNameIndex([
+            # name, source, binary, pseudo
+            ('dummy', True, True, False),
+            ('dummy-dev', False, True, False),
+            ('libdummy', False, True, False),
+            ('pseudo-dummy', False, False, True),
+            ('unknown-dummy', False, False, False),
+        ])
+
+    def test_search_default(self):
+        """
+        Tests that source and pseudo packages are searched by default, with
+        the prefix matches first.
+        """
+        self.assertEqual(['dummy', 'pseudo-dummy'], self.index.search('dum'))
+
+    def test_search_package_type(self):
+        """
+        Tests searching the packages of a given type.
+        """
+        self.assertEqual(['dummy'], self.index.search('dum', 'source'))
+        self.assertEqual(
+            ['dummy-dev', 'libdummy'], self.index.search('dum', 'binary'))
+        self.assertEqual(['pseudo-dummy'], self.index.search('dum', 'pseudo'))
+
+    def test_search_is_case_insensitive(self):
+        self.assertEqual(['dummy'], self.index.search('DUM', 'source'))
+
+    def test_search_limit(self):
+        self.assertEqual(['dummy-dev'], self.index.search('d', 'binary', 1))
+
+
+class PackageNameIndexLoadingTests(TestCase):
+    def test_index_reloaded_when_invalidated(self):
+        """
+        Tests that the index is reloaded from the database when it is
+        invalidated.
+        """
+        SourcePackageName.objects.create(name='dummy')
+        self.assertEqual(['dummy'], get_package_name_index().search('dum'))
+        # Bypass the signal handlers
+        SourcePackageName.objects.filter(name='dummy').update(name='dummy2')
+
+        invalidate_package_name_index()
+
+        self.assertEqual(['dummy2'], get_package_name_index().search('dum'))
+        self.assertEqual(
+            cache.get(GENERATION_CACHE_KEY),
+            get_package_name_index().generation)
+
+
+class WebPackageMapTests(TestCase):
+    def setUp(self):
+        self.source_name = SourcePackageName.objects.create(name='dummy')
+        source = SourcePackage.objects.create(
+            source_package_name=self.source_name, version='1.0')
+        Repository.objects.create(
+            name='default', shorthand='default',
+            default=True).add_source_package(source)
+        other_name = SourcePackageName.objects.create(name='other')
+        other_source = SourcePackage.objects.create(
+            source_package_name=other_name, version='2.0')
+        Repository.objects.create(
+            name='repo', shorthand='repo').add_source_package(other_source)
+        # The binary is built by a higher version outside of the default
+        # repository
+        binary = BinaryPackageName.objects.create(name='dummy-bin')
+        source.binary_packages.add(binary)
+        other_source.binary_packages.add(binary)
+        BinaryPackageName.objects.create(name='orphan-bin')
+        self.pseudo = PseudoPackageName.objects.create(name='pseudo')
+        self.former = PackageName.objects.create(name='former')
+        self.former.news_set.create(title='News')
+        PackageName.objects.create(name='unknown')
+
+    def test_map_not_written(self):
+        """
+        Tests that the packages are still found without the map.
+        """
+        self.assertIsNone(get_web_package_map())
+        self.assertEqual(self.source_name, get_web_package('dummy-bin'))
+
+    def test_map_entries(self):
+        """
+        Tests the entries written to the map.
+        """
+        update_web_package_map()
+        web_package_map = get_web_package_map()
+
+        self.assertEqual('source dummy', web_package_map.get('dummy'))
+        self.assertEqual('binary dummy', web_package_map.get('dummy-bin'))
+        self.assertEqual('binary ', web_package_map.get('orphan-bin'))
+        self.assertEqual('pseudo pseudo', web_package_map.get('pseudo'))
+        self.assertEqual('former former', web_package_map.get('former'))
+        self.assertIsNone(web_package_map.get('unknown'))
+
+    def test_get_web_package_uses_map(self):
+        """
+        Tests that get_web_package gives the same results with the map, with
+        at most one query.
+        """
+        update_web_package_map()
+
+        with self.assertNumQueries(1):
+            self.assertEqual(self.source_name, get_web_package('dummy-bin'))
+        with self.assertNumQueries(1):
+            self.assertEqual(self.pseudo, get_web_package('pseudo'))
+        with self.assertNumQueries(1):
+            self.assertEqual(self.former, get_web_package('former'))
+        with self.assertNumQueries(0):
+            self.assertIsNone(get_web_package('orphan-bin'))
+            self.assertIsNone(get_web_package('unknown'))
+            self.assertIsNone(get_web_package('does-not-exist'))
+
+    def test_get_web_package_missing_from_map(self):
+        """
+        Tests that names which became valid since the map was written are
+        found once the map is written again.
+        """
+        update_web_package_map()
+        pseudo = PseudoPackageName.objects.create(name='new-pseudo')
+
+        with self.assertNumQueries(0):
+            self.assertIsNone(get_web_package('new-pseudo'))
+
+        update_web_package_map()
+
+        self.assertEqual(pseudo, get_web_package('new-pseudo'))
+
+    def test_map_reopened_when_written(self):
+        """
+        Tests that a new version of the map is used once it is written.
+        """
+        update_web_package_map()
+        self.assertIsNone(get_web_package('new'))
+        SourcePackageName.objects.create(name='new')
+
+        update_web_package_map()
+
+        self.assertEqual('source new', get_web_package_map().get('new'))
@@ -16,6 +16,12 @@ Tests for the Distro Tracker core panels.
 from __future__ import unicode_literals
 from django.core.urlresolvers import reverse
 from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.http import HttpRequest
+from django.test.utils import CaptureQueriesContext
+from django.test.utils import override_settings
+from django.utils.six.moves import mock
 from bs4 import BeautifulSoup as soup
 
 from distro_tracker.test import TestCase, TemplateTestsMixin
@@ -24,7 +30,16 @@ from distro_tracker.core.models import PseudoPackageName
 from distro_tracker.core.models import PackageName
 from distro_tracker.core.models import SourcePackage
 from distro_tracker.core.models import Repository, SourcePackageRepositoryEntry
+from distro_tracker.core.models import News
+from distro_tracker.core.models import BinaryPackageName
+from distro_tracker.core.models import BinaryPackageBugStats
+from distro_tracker.core.models import PackageExtractedInfo
 from distro_tracker.core.panels import VersionedLinks, DeadPackageWarningPanel
+from distro_tracker.core.panels import BasePanel, BinariesInformationPanel
+from distro_tracker.core.panels import PackagePageData
+from distro_tracker.core.panels import get_panels_for_package
+from distro_tracker.core.panels import get_panel_classes, import_all_panels
+from distro_tracker.core.utils import distro_tracker_render_to_string
 
 
 class VersionedLinksPanelTests(TestCase):
@@ -252,3 +267,184 @@ class NewsPanelTests(TestCase, TemplateTestsMixin):
             created_by="Author {}".format(self.NEWS_LIMIT))
         response = self.get_package_page_response()
         self.assertLinkIsInResponse(response, self.news_link + "?page=2")
+
+
+@override_settings(DISTRO_TRACKER_PANELS_CACHE_TIMEOUT=3600)
+class PanelCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.package = SourcePackageName.objects.create(name='dummy-package')
+        self.news = self.package.news_set.create(title='Original title')
+
+    def get_panels_output(self):
+        """
+        Returns the concatenated output of all the panels of the package,
+        freshly retrieved from the database.
+        """
+        package = PackageName.objects.get(pk=self.package.pk)
+        panels = get_panels_for_package(package, HttpRequest())
+        return ''.join(
+            distro_tracker_render_to_string(panel.template_name, {
+                'panel': panel,
+                'package': package,
+            }) if panel.template_name else panel.html_output
+            for column in panels.values()
+            for panel in column
+        )
+
+    def test_panel_output_cached(self):
+        """
+        Tests that the cached output is used as long as the package is not
+        modified.
+        """
+        self.assertIn('Original title', self.get_panels_output())
+        # Updating through the queryset does not touch the package timestamp
+        News.objects.filter(pk=self.news.pk).update(title='Changed title')
+
+        self.assertIn('Original title', self.get_panels_output())
+
+    def test_panel_output_invalidated_when_package_modified(self):
+        """
+        Tests that the panel is rendered again once the package is modified.
+        """
+        self.get_panels_output()
+        News.objects.filter(pk=self.news.pk).update(title='Changed title')
+
+        PackageName.objects.mark_modified([self.package.pk])
+
+        self.assertIn('Changed title', self.get_panels_output())
+
+    def test_fully_cached_panels_query_count(self):
+        """
+        Tests that no query is needed to retrieve the panels of a package
+        once all of them are cached.
+        """
+        self.get_panels_output()
+        package = PackageName.objects.get(pk=self.package.pk)
+
+        with self.assertNumQueries(0):
+            panels = get_panels_for_package(package, HttpRequest())
+
+        self.assertTrue(panels)
+
+    @override_settings(DISTRO_TRACKER_PANELS_CACHE_TIMEOUT=0)
+    def test_panel_output_not_cached_when_disabled(self):
+        """
+        Tests that nothing is cached when the timeout is set to 0.
+        """
+        self.get_panels_output()
+        News.objects.filter(pk=self.news.pk).update(title='Changed title')
+
+        self.assertIn('Changed title', self.get_panels_output())
+
+
+class PanelDiscoveryTests(TestCase):
+    @mock.patch('distro_tracker.core.panels.importlib.import_module')
+    def test_panel_modules_imported_once(self, mock_import):
+        """
+        Tests that the ``tracker_panels`` modules are not looked up again
+        once the panels have been discovered.
+        """
+        import_all_panels()
+        get_panels_for_package(
+            SourcePackageName.objects.create(name='dummy-package'),
+            HttpRequest())
+
+        self.assertFalse(mock_import.called)
+
+    def test_panel_classes_follow_registrations(self):
+        """
+        Tests that the list of panel classes is rebuilt when a panel is
+        registered or unregistered.
+        """
+        panel_classes = get_panel_classes()
+        self.assertIs(panel_classes, get_panel_classes())
+        self.assertNotIn(BasePanel, panel_classes)
+
+        TestPanel = type(str('TestPanel'), (BasePanel,), {})
+        self.assertIn(TestPanel, get_panel_classes())
+
+        TestPanel.unregister_plugin()
+        self.assertEqual(panel_classes, get_panel_classes())
+
+
+@override_settings(DISTRO_TRACKER_VENDOR_RULES=None)
+class PackagePageDataTests(TestCase):
+    BINARY_COUNT = 50
+
+    def setUp(self):
+        cache.clear()
+        self.package = SourcePackageName.objects.create(name='dummy-package')
+        binaries = []
+        for i in range(self.BINARY_COUNT):
+            name = 'dummy-binary-{}'.format(i)
+            binary = BinaryPackageName.objects.create(name=name)
+            BinaryPackageBugStats.objects.create(package=binary, stats=[{
+                'category_name': 'rc',
+                'bug_count': i,
+            }])
+            binaries.append({'name': name})
+        PackageExtractedInfo.objects.create(
+            package=self.package, key='binaries', value=binaries)
+        self.general = {
+            'name': 'dummy-package',
+            'maintainer': {
+                'name': 'Maintainer',
+                'email': 'maintainer@domain.com',
+            },
+        }
+        PackageExtractedInfo.objects.create(
+            package=self.package, key='general', value=self.general)
+
+    def test_extracted_info(self):
+        """
+        Tests that all extracted information of the package is available.
+        """
+        data = PackagePageData(self.package)
+
+        self.assertEqual(self.general, data.get_extracted_info('general'))
+        self.assertEqual(
+            self.BINARY_COUNT, len(data.get_extracted_info('binaries')))
+        self.assertIsNone(data.get_extracted_info('versions'))
+
+    def test_binary_bug_stats(self):
+        """
+        Tests that the bug stats of all binaries are available.
+        """
+        data = PackagePageData(self.package)
+
+        self.assertEqual(self.BINARY_COUNT, len(data.binary_bug_stats))
+        self.assertEqual(
+            [{'category_name': 'rc', 'bug_count': 3}],
+            data.binary_bug_stats['dummy-binary-3'])
+
+    def test_binaries_panel_query_count(self):
+        """
+        Tests that the number of queries of the binaries panel does not
+        depend on the number of binaries.
+        """
+        panel = BinariesInformationPanel(self.package, None)
+
+        with CaptureQueriesContext(connection) as queries:
+            binaries = panel.context
+
+        self.assertEqual(self.BINARY_COUNT, len(binaries))
+        self.assertIn('bug_stats', binaries[0])
+        self.assertLessEqual(len(queries), 3)
+
+    def test_panels_share_page_data(self):
+        """
+        Tests that the extracted information is only retrieved once for all
+        the panels of the page.
+        """
+        package = SourcePackageName.objects.get(pk=self.package.pk)
+
+        with CaptureQueriesContext(connection) as queries:
+            get_panels_for_package(package, HttpRequest())
+
+        table = 'FROM "{}"'.format(PackageExtractedInfo._meta.db_table)
+        extracted_info_queries = [
+            query for query in queries.captured_queries
+            if table in query['sql']
+        ]
+        self.assertEqual(1, len(extracted_info_queries))
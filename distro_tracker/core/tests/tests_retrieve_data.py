@@ -31,10 +31,15 @@ from distro_tracker.core.models import Repository
 from distro_tracker.core.models import RepositoryFlag
 from distro_tracker.core.models import Architecture
 from distro_tracker.core.models import Team
+from distro_tracker.core.models import PackageExtractedInfo
 from distro_tracker.core.retrieve_data import UpdateRepositoriesTask
 from distro_tracker.core.retrieve_data import UpdateTeamPackagesTask
 from distro_tracker.core.retrieve_data import retrieve_repository_info
+from distro_tracker.core.retrieve_data import update_main_source_versions
 from distro_tracker.core.retrieve_data import UpdateVersionInformation
+from distro_tracker.core.retrieve_data import UpdatePackageGeneralInformation
+from distro_tracker.core.retrieve_data import (
+    UpdateSourceToBinariesInformation)
 from distro_tracker.test.utils import create_source_package
 from distro_tracker.test.utils import set_mock_response
 from distro_tracker.accounts.models import User, UserEmail
@@ -501,6 +506,24 @@ class RetrieveSourcesInformationTest(TestCase):
         # No events emitted since nothing was done.
         self.assertEqual(len(self.caught_events), 0)
 
+    @mock.patch(
+        'distro_tracker.core.retrieve_data.AptCache.update_repositories')
+    def test_update_repositories_marks_package_modified(
+            self, mock_update_repositories):
+        """
+        Tests that a source package is marked as modified only when its
+        repository entries change.
+        """
+        self.set_mock_sources(mock_update_repositories, 'Sources')
+        self.run_update()
+        last_modified = SourcePackageName.objects.get().last_modified
+        self.assertIsNotNone(last_modified)
+
+        self.run_update()
+
+        self.assertEqual(
+            last_modified, SourcePackageName.objects.get().last_modified)
+
     @mock.patch(
         'distro_tracker.core.retrieve_data.AptCache.update_repositories')
     def test_update_changed_binary_mapping_1(self, mock_update):
@@ -1004,6 +1027,298 @@ class UpdateVersionInformationTest(TestCase):
             self.package.source_package_name)
         self.assertFalse(versions['version_list'])
 
+    def test_execute_builds_versions_table(self):
+        """
+        Tests that the versions table lists the highest version found in each
+        repository, ordered by repository position.
+        """
+        repo2 = Repository.objects.create(
+            name='repo2', shorthand='repo2', uri='http://repo2.org/',
+            position=-1, default=True)
+        for version in ('0.9', '1.1'):
+            repo2.add_source_package(create_source_package({
+                'name': 'dummy-package',
+                'version': version,
+                'directory': 'pool/d/dummy-package',
+            }))
+        job_state = mock.create_autospec(JobState)
+        job_state.events_for_task.return_value = []
+        job_state.processed_tasks = []
+        self.update.job = mock.create_autospec(Job)
+        self.update.job.job_state = job_state
+
+        self.update.execute()
+
+        versions = PackageExtractedInfo.objects.get(
+            key='versions', package__name='dummy-package').value
+        self.assertEqual(
+            [('repo2', '1.1'), ('repo1', '1.0.0')],
+            [(item['repository']['shorthand'], item['version'])
+             for item in versions['version_list']])
+        self.assertEqual('http://repo2.org/pool/d/dummy-package',
+                         versions['default_pool_url'])
+
+
+class UpdateMainSourceVersionsTest(TestCase):
+    """
+    Tests for the
+    :func:`distro_tracker.core.retrieve_data.update_main_source_versions`
+    function.
+    """
+    def setUp(self):
+        self.default_repository = Repository.objects.create(
+            name='default', shorthand='default', default=True)
+        self.other_repository = Repository.objects.create(
+            name='other', shorthand='other')
+        self.package = create_source_package({
+            'name': 'dummy-package',
+            'version': '1.0.0',
+        })
+        self.entry = self.default_repository.add_source_package(self.package)
+        newer = create_source_package({
+            'name': 'dummy-package',
+            'version': '2.0.0',
+        })
+        self.other_repository.add_source_package(newer)
+
+    def test_main_version_stored(self):
+        """
+        Tests that the stored main version follows the same rules as the
+        computed one.
+        """
+        self.assertEqual(1, update_main_source_versions(['dummy-package']))
+
+        package = SourcePackageName.objects.get(name='dummy-package')
+        self.assertEqual(self.entry, package.main_source_entry)
+        self.assertEqual(self.package, package.main_source_version)
+        self.assertEqual(package.compute_main_entry(), package.main_entry)
+        self.assertEqual(package.compute_main_version(), package.main_version)
+
+    def test_unchanged_main_version_not_written(self):
+        """
+        Tests that packages whose main version did not change are not
+        updated again.
+        """
+        update_main_source_versions()
+
+        self.assertEqual(0, update_main_source_versions())
+
+    def test_main_version_cleared(self):
+        """
+        Tests that the stored main version is cleared once the package is no
+        longer found in any repository, :attr:`main_version` then falling
+        back to the highest remaining source package version.
+        """
+        update_main_source_versions()
+        SourcePackageRepositoryEntry.objects.all().delete()
+
+        update_main_source_versions()
+
+        package = SourcePackageName.objects.get(name='dummy-package')
+        self.assertIsNone(package.main_source_entry)
+        self.assertIsNone(package.main_source_version)
+        self.assertIsNone(package.main_entry)
+        self.assertEqual('2.0.0', package.main_version.version)
+
+    def test_main_version_follows_repository_deletion(self):
+        """
+        Tests that the stored main version and entry are recomputed when the
+        repository of the main entry is deleted.
+        """
+        update_main_source_versions()
+
+        self.default_repository.delete()
+
+        package = SourcePackageName.objects.get(name='dummy-package')
+        self.assertEqual(self.other_repository,
+                         package.main_source_entry.repository)
+        self.assertEqual('2.0.0', package.main_source_version.version)
+        self.assertEqual(package.compute_main_version(), package.main_version)
+        self.assertIsNotNone(package.last_modified)
+
+    def test_main_version_cleared_on_last_repository_deletion(self):
+        """
+        Tests that the stored main version and entry are both cleared when the
+        package is deleted from all its repositories.
+        """
+        update_main_source_versions()
+
+        Repository.objects.all().delete()
+
+        package = SourcePackageName.objects.get(name='dummy-package')
+        self.assertIsNone(package.main_source_entry)
+        self.assertIsNone(package.main_source_version)
+
+
+class UpdatePackageGeneralInformationTest(TestCase):
+    """
+    Tests for the
+    :class:`distro_tracker.core.retrieve_data.UpdatePackageGeneralInformation`
+    task.
+    """
+    def setUp(self):
+        self.default_repository = Repository.objects.create(
+            name='default', shorthand='default', default=True)
+        self.other_repository = Repository.objects.create(
+            name='other', shorthand='other')
+        Architecture.objects.get_or_create(name='i386')
+        Architecture.objects.get_or_create(name='amd64')
+        self.package = create_source_package({
+            'name': 'dummy-package',
+            'version': '1.0.0',
+            'maintainer': {
+                'name': 'Maintainer',
+                'email': 'maintainer@domain.com',
+            },
+            'uploaders': ['uploader@domain.com'],
+            'architectures': ['i386', 'amd64'],
+        })
+        self.default_repository.add_source_package(
+            self.package, priority='optional', section='utils')
+
+        self.job_state = mock.create_autospec(JobState)
+        self.job_state.events_for_task.return_value = []
+        self.job_state.processed_tasks = []
+        self.job = mock.create_autospec(Job)
+        self.job.job_state = self.job_state
+        self.task = UpdatePackageGeneralInformation()
+        self.task.job = self.job
+
+    def get_general_info(self, package_name='dummy-package'):
+        return PackageExtractedInfo.objects.get(
+            key='general', package__name=package_name).value
+
+    def test_general_info_created(self):
+        """
+        Tests that the general information is extracted from the main entry
+        of the package.
+        """
+        self.task.execute()
+
+        general = self.get_general_info()
+        self.assertEqual('dummy-package', general['name'])
+        self.assertEqual('1.0.0', general['version'])
+        self.assertEqual('optional', general['priority'])
+        self.assertEqual('utils', general['section'])
+        self.assertEqual('maintainer@domain.com',
+                         general['maintainer']['email'])
+        self.assertEqual(['uploader@domain.com'],
+                         [u['email'] for u in general['uploaders']])
+        self.assertEqual(['amd64', 'i386'], general['architectures'])
+
+    def test_general_info_uses_default_repository(self):
+        """
+        Tests that a higher version found outside of the default repository
+        does not take precedence over the version in the default repository.
+        """
+        newer = create_source_package({
+            'name': 'dummy-package',
+            'version': '2.0.0',
+            'maintainer': {'email': 'maintainer@domain.com'},
+        })
+        self.other_repository.add_source_package(newer)
+
+        self.task.execute()
+
+        self.assertEqual('1.0.0', self.get_general_info()['version'])
+
+    def test_general_info_only_changed_rows_written(self):
+        """
+        Tests that running the task when nothing changed does not write
+        anything to the database.
+        """
+        self.task.execute()
+
+        with mock.patch.object(PackageExtractedInfo, 'save') as mock_save:
+            self.task.execute()
+
+        self.assertFalse(mock_save.called)
+        self.assertEqual(1, PackageExtractedInfo.objects.count())
+
+    def test_general_info_updated_for_event_packages(self):
+        """
+        Tests that only the packages given in the events are updated when the
+        task is not the initial task of the job.
+        """
+        other = create_source_package({
+            'name': 'other-package',
+            'version': '1.0.0',
+            'maintainer': {'email': 'maintainer@domain.com'},
+        })
+        self.default_repository.add_source_package(other)
+        self.job_state.processed_tasks = ['UpdateRepositoriesTask']
+        self.job_state.events_for_task.return_value = [
+            Event(name='new-source-package-version-in-repository',
+                  arguments={'name': 'dummy-package'}),
+        ]
+
+        self.task.execute()
+
+        self.assertEqual('dummy-package', self.get_general_info()['name'])
+        self.assertFalse(PackageExtractedInfo.objects.filter(
+            package__name='other-package').exists())
+
+
+class UpdateSourceToBinariesInformationTest(TestCase):
+    """
+    Tests for the
+    :class:`distro_tracker.core.retrieve_data.UpdateSourceToBinariesInformation`
+    task.
+    """
+    def setUp(self):
+        self.repository = Repository.objects.create(
+            name='repo', shorthand='repo', default=True)
+        self.other_repository = Repository.objects.create(
+            name='other', shorthand='other')
+        self.repository.add_source_package(create_source_package({
+            'name': 'dummy-package',
+            'version': '1.0.0',
+            'binary_packages': ['dummy-package-bin', 'dummy-package-doc'],
+        }))
+        self.other_repository.add_source_package(create_source_package({
+            'name': 'dummy-package',
+            'version': '2.0.0',
+            'binary_packages': ['dummy-package-new'],
+        }))
+        self.repository.add_source_package(create_source_package({
+            'name': 'no-binaries',
+            'version': '1.0.0',
+        }))
+
+        job_state = mock.create_autospec(JobState)
+        job_state.events_for_task.return_value = []
+        job_state.processed_tasks = []
+        self.task = UpdateSourceToBinariesInformation()
+        self.task.job = mock.create_autospec(Job)
+        self.task.job.job_state = job_state
+
+    def get_binaries(self, package_name):
+        return PackageExtractedInfo.objects.get(
+            key='binaries', package__name=package_name).value
+
+    def test_binaries_of_main_version(self):
+        """
+        Tests that the binaries of the main version are stored along with the
+        repository of the main entry.
+        """
+        self.task.execute()
+
+        binaries = self.get_binaries('dummy-package')
+        self.assertEqual(
+            ['dummy-package-bin', 'dummy-package-doc'],
+            [binary['name'] for binary in binaries])
+        for binary in binaries:
+            self.assertEqual('repo', binary['repository']['shorthand'])
+
+    def test_main_version_without_binaries(self):
+        """
+        Tests that a main version without any binary package gets an empty
+        list.
+        """
+        self.task.execute()
+
+        self.assertEqual([], self.get_binaries('no-binaries'))
+
 
 class UpdateTeamPackagesTaskTests(TestCase):
     """
@@ -22,6 +22,7 @@ from distro_tracker.core.tasks import Event
 from distro_tracker.core.tasks import JobState
 from distro_tracker.core.tasks import run_task, continue_task_from_state
 from distro_tracker.core.tasks import run_all_tasks
+from distro_tracker.core.tasks import prefetch_remote_resources
 import logging
 logging.disable(logging.CRITICAL)
 
@@ -364,6 +365,60 @@ class JobTests(TestCase):
             [root_task, fail_task, depends_on_fail, do_run]
         )
 
+    def create_fetching_task_class(self, urls):
+        """
+        Helper method creating a task class which reads the given remote
+        resources.
+        """
+        task_class = self.create_task_class((), (), ())
+        fetched = self.fetched = getattr(self, 'fetched', {})
+
+        def get_remote_resources(self):
+            return urls
+
+        def execute(self):
+            for url in urls:
+                fetched[url] = self.update_remote_resource(url)
+
+        task_class.get_remote_resources = get_remote_resources
+        task_class.execute = execute
+        return task_class
+
+    @mock.patch('distro_tracker.core.tasks.update_cached_resources')
+    def test_run_all_tasks_prefetches_resources(self, mock_update, *args):
+        """
+        Tests that the remote resources of all the tasks are fetched at once,
+        before any of them runs, and handed over to the tasks.
+        """
+        urls = ['http://a.example/1', 'http://a.example/2', 'http://b.example']
+        self.create_fetching_task_class(urls[:2])
+        self.create_fetching_task_class(urls[2:])
+        mock_update.return_value = {
+            url: (mock.sentinel.response, True) for url in urls
+        }
+
+        run_all_tasks()
+
+        self.assertEqual(1, mock_update.call_count)
+        self.assertEqual(urls, list(mock_update.call_args[0][0]))
+        self.assertEqual({url: (mock.sentinel.response, True) for url in urls},
+                         self.fetched)
+
+    @mock.patch('distro_tracker.core.tasks.update_cached_resources')
+    def test_prefetched_resource_failure(self, mock_update, *args):
+        """
+        Tests that the task gets the exception raised when its resource was
+        fetched.
+        """
+        url = 'http://a.example'
+        task = self.create_fetching_task_class([url])()
+        mock_update.return_value = {url: ValueError()}
+
+        prefetch_remote_resources([task])
+
+        with self.assertRaises(ValueError):
+            task.update_remote_resource(url)
+
 
 class JobPersistenceTests(TestCase):
     def create_mock_event(self, event_name, event_arguments=None):
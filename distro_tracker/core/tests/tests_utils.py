@@ -20,8 +20,15 @@ from email.header import Header
 from email.mime.multipart import MIMEMultipart
 from email.mime.base import MIMEBase
 import os
+import io
+import gzip
+import json
 import time
+import random
 import tempfile
+import itertools
+
+import apt_pkg
 
 from debian import deb822
 from django.core import mail
@@ -38,10 +45,14 @@ from distro_tracker.core.utils import now
 from distro_tracker.core.utils import SpaceDelimitedTextField
 from distro_tracker.core.utils import PrettyPrintList
 from distro_tracker.core.utils import verify_signature
+from distro_tracker.core.utils import get_data_checksum
+from distro_tracker.core.utils import iter_json_array
+from distro_tracker.core.utils import iter_json_object_items
 from distro_tracker.core.utils.packages import AptCache
 from distro_tracker.core.utils.packages import extract_vcs_information
 from distro_tracker.core.utils.packages import extract_dsc_file_name
 from distro_tracker.core.utils.packages import package_hashdir
+from distro_tracker.core.utils.packages import version_sort_key
 from distro_tracker.core.utils.datastructures import DAG, InvalidDAGException
 from distro_tracker.core.utils.email_messages import CustomEmailMessage
 from distro_tracker.core.utils.email_messages import decode_header
@@ -55,6 +66,7 @@ from distro_tracker.core.utils.linkify import LinkifyHttpLinks
 from distro_tracker.core.utils.linkify import LinkifyCVELinks
 from distro_tracker.core.utils.http import HttpCache
 from distro_tracker.core.utils.http import get_resource_content
+from distro_tracker.core.utils.http import update_cached_resources
 from distro_tracker.test import TestCase, SimpleTestCase
 from distro_tracker.test.utils import set_mock_response
 from distro_tracker.test.utils import make_temp_directory
@@ -632,6 +644,125 @@ class SpaceDelimitedTextFieldTest(SimpleTestCase):
         )
 
 
+class DataChecksumTest(SimpleTestCase):
+    """
+    Tests for the :func:`distro_tracker.core.utils.get_data_checksum`
+    function.
+    """
+    def test_checksum_ignores_key_order(self):
+        first = {'a': 1, 'b': [1, 2]}
+        second = {'b': [1, 2], 'a': 1}
+
+        self.assertEqual(get_data_checksum(first), get_data_checksum(second))
+        self.assertEqual(32, len(get_data_checksum(first)))
+
+    def test_checksum_depends_on_data(self):
+        self.assertNotEqual(get_data_checksum({'a': 1}),
+                            get_data_checksum({'a': 2}))
+        self.assertNotEqual(get_data_checksum([1, 2]),
+                            get_data_checksum([2, 1]))
+
+
+class IterJsonArrayTest(SimpleTestCase):
+    """
+    Tests for the :func:`distro_tracker.core.utils.iter_json_array`
+    function.
+    """
+    DATA = [
+        {'package': 'dummy', 'hints': {'id': [{'tag': 'tag'}]}},
+        12345,
+        -1.5e10,
+        'caf\xe9',
+        [],
+        {},
+        None,
+        True,
+    ]
+
+    def parse(self, content, chunk_size=64 * 1024):
+        return list(iter_json_array(io.BytesIO(content), chunk_size))
+
+    def test_elements(self):
+        """
+        Tests that all the elements of the array are returned, whatever the
+        chunks in which the content is read.
+        """
+        content = json.dumps(self.DATA, indent=2, ensure_ascii=False)
+        content = content.encode('utf-8')
+
+        for chunk_size in (1, 2, 3, 7, 1024):
+            self.assertEqual(self.DATA, self.parse(content, chunk_size))
+
+    def test_empty_array(self):
+        self.assertEqual([], self.parse(b' [ ] '))
+
+    def test_gzip_file(self):
+        """
+        Tests that the array can be read from a gzip stream.
+        """
+        compressed = io.BytesIO()
+        with gzip.GzipFile(fileobj=compressed, mode='wb') as gzip_file:
+            gzip_file.write(json.dumps(self.DATA).encode('utf-8'))
+        compressed.seek(0)
+
+        elements = iter_json_array(gzip.GzipFile(fileobj=compressed), 5)
+
+        self.assertEqual(self.DATA, list(elements))
+
+    def test_invalid_content(self):
+        """
+        Tests that a :exc:`ValueError` is raised for content which is not a
+        valid JSON array.
+        """
+        for content in (b'', b'{}', b'[1,', b'[1 2]', b'[1,]', b'[1'):
+            with self.assertRaises(ValueError):
+                self.parse(content, 1)
+
+
+class IterJsonObjectItemsTest(SimpleTestCase):
+    """
+    Tests for the :func:`distro_tracker.core.utils.iter_json_object_items`
+    function.
+    """
+    def parse(self, content, chunk_size=64 * 1024):
+        return list(iter_json_object_items(io.BytesIO(content), chunk_size))
+
+    def test_items(self):
+        """
+        Tests that all the items of the object are returned along with the
+        JSON text of their value, whatever the chunks in which the content is
+        read.
+        """
+        content = (
+            '{"dummy": {"CVE-1": {"releases": {"sid": []}}},\n'
+            ' "caf\xe9" : [1, "]", {"a": "}"}] , "number": 12345,'
+            ' "empty": {}}'
+        ).encode('utf-8')
+        expected = [
+            ('dummy', {'CVE-1': {'releases': {'sid': []}}},
+             '{"CVE-1": {"releases": {"sid": []}}}'),
+            ('caf\xe9', [1, ']', {'a': '}'}], '[1, "]", {"a": "}"}]'),
+            ('number', 12345, '12345'),
+            ('empty', {}, '{}'),
+        ]
+
+        for chunk_size in (1, 2, 3, 7, 1024):
+            self.assertEqual(expected, self.parse(content, chunk_size))
+
+    def test_empty_object(self):
+        self.assertEqual([], self.parse(b' { } '))
+
+    def test_invalid_content(self):
+        """
+        Tests that a :exc:`ValueError` is raised for content which is not a
+        valid JSON object.
+        """
+        for content in (b'', b'[]', b'{"a"}', b'{"a": 1', b'{1: 2}',
+                        b'{"a": 1,}', b'{"a": 1 "b": 2}'):
+            with self.assertRaises(ValueError):
+                self.parse(content, 1)
+
+
 class PackageUtilsTests(SimpleTestCase):
     """
     Tests the distro_tracker.core.utils.packages utlity functions.
@@ -745,6 +876,104 @@ Section: libs
         }))
 
 
+class VersionSortKeyTests(SimpleTestCase):
+    """
+    Tests that :func:`distro_tracker.core.utils.packages.version_sort_key`
+    orders versions exactly like ``apt_pkg.version_compare``.
+    """
+    #: Characters covering each class of the dpkg ordering: digits (with
+    #: leading zeros), letters of both cases, the tilde and other symbols.
+    ALPHABET = '019aZ~.+'
+
+    def setUp(self):
+        apt_pkg.init_system()
+        self.keys = {}
+
+    def get_key(self, version):
+        if version not in self.keys:
+            self.keys[version] = version_sort_key(version)
+        return self.keys[version]
+
+    def assert_same_order(self, version1, version2):
+        def sign(value):
+            return (value > 0) - (value < 0)
+
+        key1, key2 = self.get_key(version1), self.get_key(version2)
+        self.assertEqual(
+            sign(apt_pkg.version_compare(version1, version2)),
+            sign((key1 > key2) - (key1 < key2)),
+            "{} and {} are not ordered like dpkg does".format(
+                version1, version2))
+
+    def all_strings(self, max_length):
+        for length in range(max_length + 1):
+            for chars in itertools.product(self.ALPHABET, repeat=length):
+                yield ''.join(chars)
+
+    def test_known_orderings(self):
+        versions = [
+            '1.0~rc1', '1.0', '1.0-0ubuntu1', '1.0-1~bpo1', '1.0-1',
+            '1.0-1+b1', '1.0-1.1', '1.0a', '1.0.0', '1.1', '1.10', '2',
+            '1:0.1',
+        ]
+        for version1, version2 in zip(versions, versions[1:]):
+            self.assertLess(version_sort_key(version1),
+                            version_sort_key(version2))
+
+    def test_equivalent_versions(self):
+        self.assertEqual(version_sort_key('1.0'), version_sort_key('1.00'))
+        self.assertEqual(version_sort_key('1.0'), version_sort_key('0:1.0'))
+        self.assertEqual(version_sort_key('1.0'), version_sort_key('1.0-0'))
+
+    def test_key_is_lowercase_hexadecimal(self):
+        key = version_sort_key('1:2.0~beta+dfsg-3')
+        self.assertEqual(key, key.lower())
+        int(key, 16)
+
+    def test_all_upstream_versions(self):
+        """
+        Exhaustively compares all upstream versions of up to three
+        characters.
+        """
+        upstreams = [
+            upstream
+            for upstream in self.all_strings(3)
+            if upstream and upstream[0].isdigit()
+        ]
+        for upstream1, upstream2 in itertools.product(upstreams, repeat=2):
+            self.assert_same_order(upstream1, upstream2)
+
+    def test_all_revisions(self):
+        """
+        Exhaustively compares all Debian revisions of one to three
+        characters. An empty revision (``1.0-``) is not a valid version.
+        """
+        revisions = [revision for revision in self.all_strings(3) if revision]
+        for revision1, revision2 in itertools.product(revisions, repeat=2):
+            self.assert_same_order('1.0-' + revision1, '1.0-' + revision2)
+        for revision in revisions:
+            self.assert_same_order('1.0', '1.0-' + revision)
+
+    def test_random_versions(self):
+        """
+        Compares randomly generated full versions, including epochs.
+        """
+        rand = random.Random(42)
+
+        def random_version():
+            epoch = rand.choice(['', '0:', '1:', '10:'])
+            upstream = rand.choice('0123456789') + ''.join(
+                rand.choice(self.ALPHABET + '-')
+                for _ in range(rand.randint(0, 8)))
+            revision = ''.join(
+                rand.choice(self.ALPHABET)
+                for _ in range(rand.randint(0, 4)))
+            return epoch + upstream + ('-' + revision if revision else '')
+
+        for _ in range(5000):
+            self.assert_same_order(random_version(), random_version())
+
+
 class HttpCacheTest(SimpleTestCase):
     def set_mock_response(self, mock_requests, headers=None, status_code=200):
         set_mock_response(
@@ -815,6 +1044,91 @@ class HttpCacheTest(SimpleTestCase):
             self.assertIn(key, cached_headers)
             self.assertEqual(value, cached_headers[key])
 
+    @mock.patch('distro_tracker.core.utils.http.requests')
+    def test_open_content(self, mock_requests):
+        """
+        Tests that the content of a cached response can be read from a file.
+        """
+        self.set_mock_response(mock_requests)
+        cache = HttpCache(self.cache_directory)
+        url = 'http://example.com'
+        self.assertIsNone(cache.open_content(url))
+
+        cache.update(url)
+
+        with cache.open_content(url) as content_file:
+            self.assertEqual(self.response_content, content_file.read())
+
+    @mock.patch('distro_tracker.core.utils.http.requests')
+    def test_update_stream(self, mock_requests):
+        """
+        Tests that the content of a streamed response is written to the cache
+        as it is downloaded.
+        """
+        self.set_mock_response(mock_requests)
+        mock_requests.get.return_value.iter_content.return_value = [
+            b'Simple ', b'response']
+        cache = HttpCache(self.cache_directory)
+        url = 'http://example.com'
+
+        cache.update(url, stream=True)
+
+        self.assertTrue(mock_requests.get.call_args[1]['stream'])
+        self.assertEqual(self.response_content, cache.get_content(url))
+
+    @mock.patch('distro_tracker.core.utils.http.requests')
+    def test_update_cached_resources(self, mock_requests):
+        """
+        Tests that the responses of several URLs are cached at once, failures
+        being returned instead of raised.
+        """
+        self.set_mock_response(mock_requests)
+        response = mock_requests.get.return_value
+
+        def get(url, **kwargs):
+            if url == 'http://broken.example.com':
+                raise ValueError(url)
+            return response
+        mock_requests.get.side_effect = get
+        cache = HttpCache(self.cache_directory)
+        urls = ['http://example.com', 'http://example.com/other',
+                'http://broken.example.com']
+
+        results = update_cached_resources(
+            urls, cache=cache, forced_urls=['http://example.com/other'])
+
+        self.assertEqual((response, True), results['http://example.com'])
+        self.assertIsInstance(results['http://broken.example.com'],
+                              ValueError)
+        self.assertEqual(self.response_content,
+                         cache.get_content('http://example.com/other'))
+        forced = [call for call in mock_requests.get.call_args_list
+                  if call[0][0] == 'http://example.com/other'][0]
+        self.assertEqual('no-cache', forced[1]['headers']['Cache-Control'])
+
+    @mock.patch('distro_tracker.core.utils.http.requests')
+    def test_update_cached_resources_skips_fresh(self, mock_requests):
+        """
+        Tests that the URLs whose cached response is still fresh are not
+        requested again, unless they are forced.
+        """
+        self.set_mock_response(mock_requests, headers={
+            'Cache-Control': 'must-revalidate, max-age=3600',
+        })
+        cache = HttpCache(self.cache_directory)
+        urls = ['http://example.com', 'http://example.com/other']
+        for url in urls:
+            cache.update(url)
+        mock_requests.get.reset_mock()
+
+        results = update_cached_resources(
+            urls, cache=cache, forced_urls=['http://example.com/other'])
+
+        self.assertEqual(['http://example.com/other'], list(results))
+        self.assertEqual(1, mock_requests.get.call_count)
+        self.assertEqual(self.response_content,
+                         cache.get_content('http://example.com'))
+
     @mock.patch('distro_tracker.core.utils.http.requests')
     def test_cache_not_expired(self, mock_requests):
         """
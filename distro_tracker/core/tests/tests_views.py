@@ -20,6 +20,8 @@ from distro_tracker.core.models import SourcePackageName, SourcePackage
 from distro_tracker.core.models import PackageName, PseudoPackageName
 from distro_tracker.core.models import News
 from distro_tracker.core.models import ActionItem, ActionItemType
+from distro_tracker.core.models import PackageBugStats
+from distro_tracker.core.models import PackageExtractedInfo
 import json
 
 from django.core.urlresolvers import reverse
@@ -413,6 +415,32 @@ class PackageAutocompleteViewTest(TestCase):
         self.assertEqual(response[0], '-dev')
         self.assertEqual(len(response[1]), 0)
 
+    def test_prefix_matches_listed_first(self):
+        """
+        Tests that the packages whose name starts with the query are listed
+        before the other matching packages.
+        """
+        response = self.client.get(reverse('dtracker-api-package-autocomplete'),
+                                   {'q': 'p'})
+
+        response = json.loads(response.content.decode('utf-8'))
+        self.assertEqual(
+            ['package', 'pseudo-package', 'd-package', 'dummy-package'],
+            response[1])
+
+    def test_new_package_autocomplete(self):
+        """
+        Tests that a package created after a previous query is found.
+        """
+        url = reverse('dtracker-api-package-autocomplete')
+        self.client.get(url, {'q': 'p'})
+        SourcePackageName.objects.create(name='new-package')
+
+        response = json.loads(
+            self.client.get(url, {'q': 'new'}).content.decode('utf-8'))
+
+        self.assertEqual(['new-package'], response[1])
+
     def test_no_query_given(self):
         """
         Tests the autocomplete when there is no query parameter given.
@@ -477,6 +505,171 @@ class ActionItemJsonViewTest(TestCase):
         self.assertEqual(response.status_code, 404)
 
 
+class PackageSummariesViewTest(TestCase):
+    """
+    Tests for the :class:`distro_tracker.core.views.PackageSummariesView`.
+    """
+    def setUp(self):
+        self.action_type = ActionItemType.objects.create(type_name='test')
+        self.packages = [
+            SourcePackageName.objects.create(name='package{}'.format(i))
+            for i in range(10)
+        ]
+        for package in self.packages:
+            PackageExtractedInfo.objects.create(
+                package=package, key='general', value={'name': package.name})
+            PackageExtractedInfo.objects.create(
+                package=package, key='versions', value={'default_pool_url': ''})
+            PackageBugStats.objects.create(
+                package=package,
+                stats=[{'category_name': 'rc', 'bug_count': 1}])
+            ActionItem.objects.create(
+                package=package, item_type=self.action_type,
+                short_description='Description of ' + package.name)
+        self.pseudo_package = PseudoPackageName.objects.create(name='pseudo')
+        self.url = reverse('dtracker-api-package-summaries')
+
+    def get_json(self, response):
+        return json.loads(response.content.decode('utf-8'))
+
+    def test_summaries(self):
+        response = self.client.get(self.url, {
+            'package': ['package1', 'pseudo', 'unknown'],
+        })
+
+        self.assertEqual('application/json', response['Content-Type'])
+        summaries = self.get_json(response)
+        self.assertEqual(['package1', 'pseudo'], sorted(summaries))
+        self.assertEqual({
+            'name': 'package1',
+            'general': {'name': 'package1'},
+            'versions': {'default_pool_url': ''},
+            'binaries': None,
+            'bugs': [{'category_name': 'rc', 'bug_count': 1}],
+            'action_items': [{
+                'type': 'test',
+                'short_description': 'Description of package1',
+                'severity': 'normal',
+            }],
+        }, summaries['package1'])
+        self.assertEqual([], summaries['pseudo']['action_items'])
+
+    def test_summaries_number_of_queries(self):
+        """
+        Tests that the number of queries does not depend on the number of
+        packages.
+        """
+        with self.assertNumQueries(4):
+            response = self.client.post(self.url, {
+                'package': [package.name for package in self.packages],
+            })
+
+        self.assertEqual(10, len(self.get_json(response)))
+
+    def test_summaries_no_package(self):
+        self.assertEqual(400, self.client.get(self.url).status_code)
+
+    def test_summaries_gzipped(self):
+        response = self.client.get(
+            self.url, {'package': [package.name for package in self.packages]},
+            HTTP_ACCEPT_ENCODING='gzip')
+
+        self.assertEqual('gzip', response['Content-Encoding'])
+
+    def test_all_summaries_streamed(self):
+        response = self.client.get(self.url, {'all': '1'})
+
+        self.assertTrue(response.streaming)
+        self.assertEqual('application/x-ndjson', response['Content-Type'])
+        content = b''.join(response.streaming_content).decode('utf-8')
+        summaries = [json.loads(line) for line in content.splitlines()]
+        self.assertEqual(
+            [package.name for package in self.packages] + ['pseudo'],
+            [summary['name'] for summary in summaries])
+        self.assertEqual(
+            'Description of package0',
+            summaries[0]['action_items'][0]['short_description'])
+
+
+class ConditionalResponseTests(TestCase):
+    """
+    Tests the conditional responses of the views displaying package data.
+    """
+    def setUp(self):
+        self.package = SourcePackageName.objects.create(name='dummy-package')
+        self.package.news_set.create(title='News')
+        self.action_type = ActionItemType.objects.create(
+            type_name='test',
+            full_description_template='action-item-test.html')
+        self.add_test_template_dir()
+
+    def assert_conditional(self, url):
+        """
+        Checks that the view answers with a 304 response when the ETag of the
+        package data did not change and with a new response once it did.
+        """
+        response = self.client.get(url)
+        self.assertEqual(200, response.status_code)
+        self.assertIn('ETag', response)
+        self.assertIn('Last-Modified', response)
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(304, response.status_code)
+
+        etag = response['ETag']
+        PackageName.objects.mark_modified([self.package.pk])
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(200, response.status_code)
+        self.assertNotEqual(etag, response['ETag'])
+
+    def test_package_page(self):
+        self.assert_conditional(reverse('dtracker-package-page', kwargs={
+            'package_name': self.package.name,
+        }))
+
+    def test_package_news(self):
+        self.assert_conditional(reverse('dtracker-package-news', kwargs={
+            'package_name': self.package.name,
+        }))
+
+    def test_package_news_feed(self):
+        self.assert_conditional(
+            reverse('dtracker-package-rss-news-feed', kwargs={
+                'package_name': self.package.name,
+            }))
+
+    def test_package_never_modified(self):
+        """
+        Tests that no ETag is given for a package whose data never changed.
+        """
+        package = SourcePackageName.objects.create(name='other-package')
+
+        response = self.client.get(reverse('dtracker-package-page', kwargs={
+            'package_name': package.name,
+        }))
+
+        self.assertEqual(200, response.status_code)
+        self.assertNotIn('ETag', response)
+
+    def test_action_item(self):
+        """
+        Tests that the JSON action item view honours If-Modified-Since.
+        """
+        action_item = ActionItem.objects.create(
+            package=self.package,
+            item_type=self.action_type,
+            short_description='Short description')
+        url = reverse('dtracker-api-action-item', kwargs={
+            'item_pk': action_item.pk,
+        })
+        response = self.client.get(url)
+
+        response = self.client.get(
+            url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+
+        self.assertEqual(304, response.status_code)
+
+
 class NewsViewTest(TestCase, TemplateTestsMixin):
     """
     Tests for the :class:`distro_tracker.core.views.PackageNews`.
@@ -10,12 +10,15 @@
 """Various utilities for the distro-tracker project."""
 from __future__ import unicode_literals
 from django.template.loader import render_to_string
+from django.core.serializers.json import DjangoJSONEncoder
 from django.http import HttpResponse
 from django.db import models
 from django.utils import six
 from django.conf import settings
 import os
 import json
+import codecs
+import hashlib
 import lzma
 import gpgme
 import tarfile
@@ -77,6 +80,173 @@ def render_to_json_response(response):
     )
 
 
+def get_data_checksum(data):
+    """
+    Computes a checksum of the given data, which does not depend on the order
+    of the keys of its dictionaries.
+
+    :param data: The data to be checksummed. It must be serializable to JSON.
+    :returns: The hexadecimal MD5 digest of the JSON representation of the
+        data.
+    :rtype: string
+    """
+    json_dump = json.dumps(data, sort_keys=True, cls=DjangoJSONEncoder)
+    return hashlib.md5(json_dump.encode('utf-8')).hexdigest()
+
+
+class _JSONTextReader(object):
+    """
+    Reads JSON text decoded incrementally from a binary file object.
+    """
+    WHITESPACE = ' \t\r\n'
+
+    def __init__(self, file_obj, chunk_size):
+        self.file_obj = file_obj
+        self.chunk_size = chunk_size
+        self.json_decoder = json.JSONDecoder()
+        self.text_decoder = codecs.getincrementaldecoder('utf-8')()
+        self.text = ''
+        self.position = 0
+        # The number of characters dropped from the start of the text
+        self.dropped = 0
+        self.eof = False
+
+    def read_more(self):
+        """
+        Appends the next chunk of the file to the text, dropping the text
+        which was already consumed.
+
+        :returns: ``False`` if the end of the file was already reached.
+        """
+        if self.eof:
+            return False
+        chunk = self.file_obj.read(self.chunk_size)
+        self.eof = not chunk
+        self.text = (self.text[self.position:] +
+                     self.text_decoder.decode(chunk, self.eof))
+        self.dropped += self.position
+        self.position = 0
+        return True
+
+    def peek(self):
+        """
+        Skips whitespace and returns the next character, without consuming
+        it. ``None`` is returned at the end of the file.
+        """
+        while True:
+            while (self.position < len(self.text) and
+                   self.text[self.position] in self.WHITESPACE):
+                self.position += 1
+            if self.position < len(self.text):
+                return self.text[self.position]
+            if not self.read_more():
+                return None
+
+    def read_value(self):
+        """
+        Consumes and returns the JSON value starting at the next non
+        whitespace character.
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = self.json_decoder.raw_decode(
+                    self.text, self.position)
+            except ValueError:
+                end = None
+            # A number or literal which is not followed by a delimiter might
+            # be truncated
+            truncated = end is None or (
+                not self.eof and self.text[end - 1] not in '}]"' and (
+                    end == len(self.text) or
+                    self.text[end] not in self.WHITESPACE + ',]'))
+            if not truncated:
+                self.position = end
+                return value
+            if not self.read_more():
+                raise ValueError('Invalid JSON value')
+
+    def read_value_and_text(self):
+        """
+        Consumes the JSON value starting at the next non whitespace
+        character.
+
+        :returns: The decoded value and its JSON text.
+        """
+        self.peek()
+        start = self.dropped + self.position
+        value = self.read_value()
+        return value, self.text[start - self.dropped:self.position]
+
+
+def iter_json_array(file_obj, chunk_size=64 * 1024):
+    """
+    Parses the JSON array found in the given file object incrementally,
+    yielding its elements one at a time.
+
+    Only the element being parsed is held in memory, instead of the whole
+    document and its object graph.
+
+    :param file_obj: A file object opened in binary mode, holding a UTF-8
+        encoded JSON array.
+    :param chunk_size: The number of bytes read from the file at once.
+    :raises ValueError: When the content is not a valid JSON array.
+    """
+    reader = _JSONTextReader(file_obj, chunk_size)
+    if reader.peek() != '[':
+        raise ValueError('The JSON content is not an array')
+    reader.position += 1
+    if reader.peek() == ']':
+        return
+
+    while True:
+        yield reader.read_value()
+        char = reader.peek()
+        if char == ']':
+            return
+        if char != ',':
+            raise ValueError('Unexpected {} in the JSON array'.format(
+                repr(char) if char else 'end'))
+        reader.position += 1
+
+
+def iter_json_object_items(file_obj, chunk_size=64 * 1024):
+    """
+    Parses the JSON object found in the given file object incrementally,
+    yielding its items one at a time.
+
+    The JSON text of each value is returned along with the value, so that
+    callers can checksum it without serializing the value again.
+
+    :param file_obj: A file object opened in binary mode, holding a UTF-8
+        encoded JSON object.
+    :param chunk_size: The number of bytes read from the file at once.
+    :returns: An iterator of ``(key, value, value_text)`` tuples.
+    :raises ValueError: When the content is not a valid JSON object.
+    """
+    reader = _JSONTextReader(file_obj, chunk_size)
+    if reader.peek() != '{':
+        raise ValueError('The JSON content is not an object')
+    reader.position += 1
+    if reader.peek() == '}':
+        return
+
+    while True:
+        key = reader.read_value()
+        if not isinstance(key, six.string_types) or reader.peek() != ':':
+            raise ValueError('Invalid key in the JSON object')
+        reader.position += 1
+        value, text = reader.read_value_and_text()
+        yield key, value, text
+        char = reader.peek()
+        if char == '}':
+            return
+        if char != ',':
+            raise ValueError('Unexpected {} in the JSON object'.format(
+                repr(char) if char else 'end'))
+        reader.position += 1
+
+
 class PrettyPrintList(object):
     """
     A class which wraps the built-in :class:`list` object so that when it is
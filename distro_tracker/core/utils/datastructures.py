@@ -11,6 +11,8 @@
 from __future__ import unicode_literals
 from collections import deque
 from copy import deepcopy
+import mmap
+import os
 
 
 class InvalidDAGException(Exception):
@@ -215,3 +217,74 @@ class DAG(object):
                     reachable_nodes.append(successor.original)
 
         return set(reachable_nodes)
+
+
+class SortedFileMap(object):
+    """
+    A read-only mapping of strings to strings stored in a file, one
+    tab-separated key and value per line, sorted by key.
+
+    The file is memory-mapped, so that processes opening the same file share
+    its content, and keys are found by a binary search over the mapped bytes.
+    Neither the keys nor the values can contain tabs or newlines.
+    """
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as map_file:
+            stat = os.fstat(map_file.fileno())
+            self._stat = (stat.st_ino, stat.st_mtime, stat.st_size)
+            if stat.st_size:
+                self._data = mmap.mmap(
+                    map_file.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                # Empty files cannot be mapped
+                self._data = b''
+
+    @staticmethod
+    def write(path, items):
+        """
+        Writes the given ``(key, value)`` pairs to a new map file.
+
+        The file is replaced atomically, processes which have the previous
+        version open keep using it until they open the new one.
+        """
+        lines = sorted(
+            '{}\t{}\n'.format(key, value).encode('utf-8')
+            for key, value in items
+        )
+        new_path = path + '.new'
+        with open(new_path, 'wb') as map_file:
+            map_file.writelines(lines)
+        os.rename(new_path, path)
+
+    def is_current(self):
+        """
+        :returns: Whether the file was not replaced since it was opened.
+        """
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return False
+        return (stat.st_ino, stat.st_mtime, stat.st_size) == self._stat
+
+    def get(self, key, default=None):
+        """
+        :returns: The value of the given key or ``default`` if it is not
+            found in the map.
+        """
+        key = key.encode('utf-8')
+        data = self._data
+        low, high = 0, len(data)
+        while low < high:
+            middle = (low + high) // 2
+            start = data.rfind(b'\n', 0, middle) + 1
+            end = data.find(b'\n', start)
+            line = data[start:end]
+            line_key, _, value = line.partition(b'\t')
+            if line_key < key:
+                low = end + 1
+            elif line_key > key:
+                high = start
+            else:
+                return value.decode('utf-8')
+        return default
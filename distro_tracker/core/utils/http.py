@@ -16,7 +16,11 @@ from hashlib import md5
 from django.utils import timezone
 from django.utils.http import parse_http_date
 from django.conf import settings
+from django.utils.six.moves.urllib.parse import urlsplit
+from multiprocessing.pool import ThreadPool
+import collections
 import os
+import threading
 import time
 import json
 from requests.structures import CaseInsensitiveDict
@@ -98,6 +102,17 @@ class HttpCache(object):
             with open(self._content_cache_file_path(url), 'rb') as content_file:
                 return content_file.read()
 
+    def open_content(self, url):
+        """
+        Opens the content of the cached response for the given URL, so that
+        it can be read without loading all of it in memory.
+
+        :returns: A file object opened in binary mode, or ``None`` if the URL
+            is not cached.
+        """
+        if url in self:
+            return open(self._content_cache_file_path(url), 'rb')
+
     def get_headers(self, url):
         """
         Returns the HTTP headers of the cached response for the given URL.
@@ -118,7 +133,7 @@ class HttpCache(object):
             os.remove(self._content_cache_file_path(url))
             os.remove(self._header_cache_file_path(url))
 
-    def update(self, url, force=False):
+    def update(self, url, force=False, stream=False):
         """
         Performs an update of the cached resource. This means that it validates
         that its most current version is found in the cache by doing a
@@ -126,6 +141,9 @@ class HttpCache(object):
 
         :param force: To force the method to perform a full GET request, set
             the parameter to ``True``
+        :param stream: To write the content to the cache as it is downloaded,
+            instead of loading all of it in memory, set the parameter to
+            ``True``. The content of the returned response is then consumed.
 
         :returns: The original HTTP response and a Boolean indicating whether
             the cached value was updated.
@@ -142,8 +160,9 @@ class HttpCache(object):
             # Ask all possible intermediate proxies to return a fresh response
             headers['Cache-Control'] = 'no-cache'
 
+        kwargs = {'stream': True} if stream else {}
         response = requests.get(url, headers=headers, verify=False,
-                                allow_redirects=True)
+                                allow_redirects=True, **kwargs)
 
         # Invalidate previously cached value if the response is not valid now
         if not response.ok:
@@ -151,7 +170,11 @@ class HttpCache(object):
         elif response.status_code == 200:
             # Dump the content and headers only if a new response is generated
             with open(self._content_cache_file_path(url), 'wb') as content_file:
-                content_file.write(response.content)
+                if stream:
+                    for chunk in response.iter_content(64 * 1024):
+                        content_file.write(chunk)
+                else:
+                    content_file.write(response.content)
             with open(self._header_cache_file_path(url), 'w') as header_file:
                 json.dump(dict(response.headers), header_file)
 
@@ -201,3 +224,58 @@ def get_resource_content(url, cache=None):
         return cache.get_content(url)
     except:
         pass
+
+
+def update_cached_resources(urls, cache=None, forced_urls=(), max_workers=8,
+                            max_connections_per_host=2):
+    """
+    Updates the cached responses of the given URLs concurrently, so that the
+    time taken is bounded by the slowest of the requests instead of their
+    sum.
+
+    As done by :func:`get_resource_content`, only the URLs whose cached
+    response is expired are requested, along with the ``forced_urls``.
+
+    :param urls: The URLs of the resources to update.
+    :param cache: The cache in which the responses are stored. If it is not
+        provided, an instance of :class:`HttpCache` with a
+        ``DISTRO_TRACKER_CACHE_DIRECTORY`` cache directory is used.
+    :param forced_urls: The URLs for which a full GET request is performed,
+        as with the ``force`` parameter of :meth:`HttpCache.update`.
+    :param max_workers: The maximum number of requests running at once.
+    :param max_connections_per_host: The maximum number of requests running
+        at once against the same host.
+
+    :returns: A dict mapping each requested URL to the two-tuple returned by
+        :meth:`HttpCache.update` or to the exception it raised. The URLs
+        which were still fresh in the cache are left out.
+    """
+    urls = list(collections.OrderedDict.fromkeys(urls))
+    if not urls:
+        return {}
+    if cache is None:
+        cache = HttpCache(settings.DISTRO_TRACKER_CACHE_DIRECTORY)
+    urls = [
+        url for url in urls
+        if url in forced_urls or cache.is_expired(url)
+    ]
+    if not urls:
+        return {}
+    host_slots = {
+        host: threading.BoundedSemaphore(max_connections_per_host)
+        for host in set(urlsplit(url).netloc for url in urls)
+    }
+
+    def update(url):
+        with host_slots[urlsplit(url).netloc]:
+            try:
+                return url, cache.update(url, force=url in forced_urls)
+            except Exception as exc:
+                return url, exc
+
+    pool = ThreadPool(min(max_workers, len(urls)))
+    try:
+        return dict(pool.map(update, urls))
+    finally:
+        pool.close()
+        pool.join()
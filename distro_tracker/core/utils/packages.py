@@ -20,6 +20,7 @@ from debian import deb822
 from distro_tracker.core.utils import extract_tar_archive
 
 import os
+import re
 import apt
 import shutil
 import apt_pkg
@@ -47,6 +48,84 @@ def package_hashdir(package_name):
         return package_name[0:1]
 
 
+#: Weights used by :func:`version_sort_key` for the end of a non-digit run
+#: of a version and for the tilde, which sorts even before it.
+_VERSION_KEY_TILDE = 1
+_VERSION_KEY_END = 2
+
+
+def _version_char_weight(char):
+    """
+    Returns the byte encoding the dpkg ordering of a non-digit character:
+    the tilde sorts before anything (even the end of the string), then
+    letters and then all the other characters.
+    """
+    if char == '~':
+        return _VERSION_KEY_TILDE
+    code = ord(char)
+    if code > 127:
+        # Not allowed in Debian versions, keep them last.
+        return 255
+    if char.isalpha():
+        return code
+    return 123 + code
+
+
+def _version_part_sort_key(part):
+    """
+    Encodes a single upstream version or Debian revision following the
+    ``verrevcmp`` algorithm of dpkg: the string is split into alternating
+    non-digit and digit runs. The non-digit runs are compared character by
+    character and the digit runs are compared numerically.
+    """
+    key = bytearray()
+    # The last match is always the empty one found at the end of the string
+    runs = re.findall(r'(\D*)(\d*)', part)[:-1] or [('', '')]
+    for non_digits, digits in runs:
+        key.extend(_version_char_weight(char) for char in non_digits)
+        key.append(_VERSION_KEY_END)
+        digits = digits.lstrip('0')
+        if len(digits) > 255:
+            raise ValueError("Version component too long: {}".format(part))
+        key.append(len(digits))
+        key.extend(ord(digit) for digit in digits)
+    # The end of the string sorts like an empty non-digit run: after a
+    # tilde but before anything else.
+    key.append(_VERSION_KEY_END)
+    return key
+
+
+def version_sort_key(version):
+    """
+    Returns a key which sorts Debian versions the same way dpkg does.
+
+    The key is a string of lowercase hexadecimal digits so that it sorts the
+    same way regardless of the database collation, which makes it usable in
+    ``ORDER BY`` clauses and indexes.
+
+    :param version: The Debian version.
+    :type version: string
+
+    :rtype: string
+    """
+    if ':' in version:
+        epoch, version = version.split(':', 1)
+    else:
+        epoch = ''
+    if '-' in version:
+        upstream, revision = version.rsplit('-', 1)
+    else:
+        upstream, revision = version, ''
+
+    key = bytearray()
+    epoch = epoch.lstrip('0')
+    key.append(len(epoch))
+    key.extend(ord(digit) for digit in epoch)
+    key.extend(_version_part_sort_key(upstream))
+    key.extend(_version_part_sort_key(revision))
+    return ''.join('{:02x}'.format(byte) for byte in key)
+
+
 def extract_vcs_information(stanza):
     """
     Extracts the VCS information from a package's Sources entry.
@@ -10,11 +10,14 @@
 """Views for the :mod:`distro_tracker.core` app."""
 from __future__ import unicode_literals
 import importlib
+import json
 from django.conf import settings
 from django.db.models import Q
 from django.shortcuts import render, redirect
 from django.shortcuts import get_object_or_404
 from django.http import Http404
+from django.http import HttpResponseBadRequest
+from django.http import StreamingHttpResponse
 from django.utils.decorators import method_decorator
 from django.views.generic import View
 from django.views.generic.edit import FormView
@@ -24,6 +27,9 @@ from django.views.generic import DeleteView
 from django.views.generic import ListView
 from django.views.generic import TemplateView
 from django.views.decorators.cache import cache_control
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.gzip import gzip_page
+from django.views.decorators.http import condition
 from django.core.mail import send_mail
 from django.core.exceptions import PermissionDenied
 from django.core.urlresolvers import reverse, reverse_lazy
@@ -32,21 +38,70 @@ from distro_tracker.core.models import get_web_package
 from distro_tracker.core.forms import CreateTeamForm
 from distro_tracker.core.forms import AddTeamMemberForm
 from distro_tracker.core.utils import render_to_json_response
-from distro_tracker.core.models import SourcePackageName, PackageName
-from distro_tracker.core.models import PseudoPackageName, BinaryPackageName
+from distro_tracker.core.models import PackageName
 from distro_tracker.core.models import ActionItem
-from distro_tracker.core.models import News, NewsRenderer
+from distro_tracker.core.models import PackageBugStats
+from distro_tracker.core.models import PackageExtractedInfo
+from distro_tracker.core.models import News
 from distro_tracker.core.models import Keyword
 from distro_tracker.core.models import Team
 from distro_tracker.core.models import TeamMembership
 from distro_tracker.core.models import MembershipConfirmation
 from distro_tracker.core.panels import get_panels_for_package
+from distro_tracker.core.package_index import get_package_name_index
 from distro_tracker.accounts.views import LoginRequiredMixin
 from distro_tracker.accounts.models import UserEmail
 from distro_tracker.core.utils import get_or_none
 from distro_tracker.core.utils import distro_tracker_render_to_string
 
 
+def _get_package_stamp(request, package_name):
+    """
+    Returns the :attr:`last_modified
+    <distro_tracker.core.models.PackageName.last_modified>` timestamp of the
+    package with the given name. It is only looked up once per request.
+    """
+    if not hasattr(request, '_dtracker_package_stamp'):
+        request._dtracker_package_stamp = PackageName.objects.filter(
+            name=package_name).values_list('last_modified', flat=True).first()
+    return request._dtracker_package_stamp
+
+
+def package_etag(request, package_name, *args, **kwargs):
+    """
+    Computes the ETag of a view displaying the data of the package with the
+    given name. ``None`` is returned when the package data was never
+    modified.
+    """
+    stamp = _get_package_stamp(request, package_name)
+    if stamp is not None:
+        return '{}:{}'.format(
+            package_name, stamp.strftime('%Y%m%d%H%M%S%f'))
+
+
+def package_last_modified(request, package_name, *args, **kwargs):
+    """
+    Returns the last modification time of a view displaying the data of the
+    package with the given name.
+    """
+    return _get_package_stamp(request, package_name)
+
+
+def _anonymous_only(func):
+    """
+    Restricts a function computing a conditional response value to anonymous
+    users, pages rendered for a logged in user depend on more than the
+    package data.
+    """
+    def wrapper(request, *args, **kwargs):
+        if request.user.is_authenticated():
+            return None
+        return func(request, *args, **kwargs)
+    return wrapper
+
+
+@condition(etag_func=_anonymous_only(package_etag),
+           last_modified_func=_anonymous_only(package_last_modified))
 def package_page(request, package_name):
     """
     Renders the package page.
@@ -128,7 +183,8 @@ class PackageAutocompleteView(View):
     A view which responds to package auto-complete queries.
 
     Renders a JSON list of package names matching the given query, meaning
-    their name starts with the given query parameter.
+    their name contains the given query parameter. The names starting with it
+    are listed first.
     """
     @method_decorator(cache_control(must_revalidate=True, max_age=3600))
     def get(self, request):
@@ -136,42 +192,19 @@ class PackageAutocompleteView(View):
             raise Http404
         query_string = request.GET['q']
         package_type = request.GET.get('package_type', None)
-        MANAGERS = {
-            'pseudo': PseudoPackageName.objects,
-            'source': SourcePackageName.objects,
-            'binary': BinaryPackageName.objects.exclude(source=True),
-        }
-        # When no package type is given include both pseudo and source packages
-        filtered = MANAGERS.get(
-            package_type,
-            PackageName.objects.filter(Q(source=True) | Q(pseudo=True))
-        )
-        filtered = filtered.filter(name__icontains=query_string)
-        # Extract only the name of the package.
-        filtered = filtered.values('name')
         # Limit the number of packages returned from the autocomplete
         AUTOCOMPLETE_ITEMS_LIMIT = 100
-        filtered = filtered[:AUTOCOMPLETE_ITEMS_LIMIT]
-        return render_to_json_response([query_string,
-                                        [package['name']
-                                         for package in filtered]])
+        names = get_package_name_index().search(
+            query_string, package_type, limit=AUTOCOMPLETE_ITEMS_LIMIT)
+        return render_to_json_response([query_string, names])
 
 
 def news_page(request, news_id):
     """
     Displays a news item's full content.
     """
-    news = get_object_or_404(News, pk=news_id)
-
-    renderer_class = \
-        NewsRenderer.get_renderer_for_content_type(news.content_type)
-    if renderer_class is None:
-        renderer_class = \
-            NewsRenderer.get_renderer_for_content_type('text/plain')
-
-    renderer = renderer_class(news)
+    news = get_object_or_404(News.objects.defer('_db_content'), pk=news_id)
     return render(request, 'core/news.html', {
-        'news_renderer': renderer,
         'news': news,
     })
 
@@ -190,12 +223,16 @@ class PackageNews(ListView):
     template_name = 'core/package_news.html'
     context_object_name = 'news'
 
+    @method_decorator(condition(etag_func=package_etag,
+                                last_modified_func=package_last_modified))
     def get(self, request, package_name):
         self.package = get_object_or_404(PackageName, name=package_name)
         return super(PackageNews, self).get(request, package_name)
 
     def get_queryset(self):
         news = self.package.news_set.prefetch_related('signed_by')
+        # Only the titles are listed
+        news = news.defer('_db_content', '_rendered_content')
         return news.order_by('-datetime_created')
 
     def get_context_data(self, *args, **kwargs):
@@ -204,12 +241,19 @@ class PackageNews(ListView):
         return context
 
 
+def _get_action_item_last_modified(request, item_pk):
+    return ActionItem.objects.filter(pk=item_pk).values_list(
+        'last_updated_timestamp', flat=True).first()
+
+
 class ActionItemJsonView(View):
     """
     View renders a :class:`distro_tracker.core.models.ActionItem` in a JSON
     response.
     """
     @method_decorator(cache_control(must_revalidate=True, max_age=3600))
+    @method_decorator(
+        condition(last_modified_func=_get_action_item_last_modified))
     def get(self, request, item_pk):
         item = get_object_or_404(ActionItem, pk=item_pk)
         return render_to_json_response(item.to_dict())
@@ -244,6 +288,116 @@ class KeywordsView(View):
         ])
 
 
+def _get_package_summaries(packages):
+    """
+    Builds the summaries of the given packages with one query for each kind
+    of data, whatever the number of packages.
+
+    :param packages: A list of ``(id, name)`` tuples of
+        :class:`PackageName <distro_tracker.core.models.PackageName>`
+        instances.
+    :returns: A list of dicts, in the order of the given packages.
+    """
+    package_ids = [package_id for package_id, _ in packages]
+    summaries = {
+        package_id: {
+            'name': name,
+            'general': None,
+            'versions': None,
+            'binaries': None,
+            'bugs': None,
+            'action_items': [],
+        }
+        for package_id, name in packages
+    }
+
+    infos = PackageExtractedInfo.objects.filter(
+        package_id__in=package_ids,
+        key__in=PackageSummariesView.EXTRACTED_INFO_KEYS)
+    for info in infos.only('package', 'key', 'value'):
+        summaries[info.package_id][info.key] = info.value
+
+    bug_stats = PackageBugStats.objects.filter(package_id__in=package_ids)
+    for stats in bug_stats.only('package', 'stats'):
+        summaries[stats.package_id]['bugs'] = stats.stats
+
+    action_items = ActionItem.objects.filter(package_id__in=package_ids)
+    action_items = action_items.select_related('item_type')
+    action_items = action_items.only(
+        'package', 'short_description', 'severity',
+        'item_type', 'item_type__type_name')
+    for item in action_items.order_by('-severity', 'item_type__type_name'):
+        summaries[item.package_id]['action_items'].append({
+            'type': item.item_type.type_name,
+            'short_description': item.short_description,
+            'severity': item.get_severity_display(),
+        })
+
+    return [summaries[package_id] for package_id in package_ids]
+
+
+class PackageSummariesView(View):
+    """
+    A view which renders the summaries of many packages at once.
+
+    The packages are given by name in ``package`` parameters, either in the
+    query string or in the body of a POST request, and their summaries are
+    rendered in a JSON object keyed by package name. Unknown packages are
+    left out.
+
+    With the ``all`` parameter, the summaries of all source and pseudo
+    packages are streamed as newline delimited JSON, one package per line.
+    """
+    #: The keys of the :class:`PackageExtractedInfo
+    #: <distro_tracker.core.models.PackageExtractedInfo>` included in the
+    #: summaries.
+    EXTRACTED_INFO_KEYS = ('general', 'versions', 'binaries')
+    #: The maximum number of packages which can be asked for at once.
+    MAX_PACKAGES = 1000
+    #: The number of packages summarized at once when streaming.
+    BATCH_SIZE = 500
+
+    @method_decorator(csrf_exempt)
+    @method_decorator(gzip_page)
+    def dispatch(self, *args, **kwargs):
+        return super(PackageSummariesView, self).dispatch(*args, **kwargs)
+
+    def get(self, request):
+        if 'all' in request.GET:
+            return self.render_all_summaries()
+        return self.render_summaries(request.GET.getlist('package'))
+
+    def post(self, request):
+        return self.render_summaries(request.POST.getlist('package'))
+
+    def render_summaries(self, names):
+        if not names:
+            return HttpResponseBadRequest('No package given')
+        if len(names) > self.MAX_PACKAGES:
+            return HttpResponseBadRequest(
+                'At most {} packages can be given'.format(self.MAX_PACKAGES))
+        packages = PackageName.objects.filter(name__in=set(names))
+        summaries = _get_package_summaries(
+            list(packages.values_list('id', 'name')))
+        return render_to_json_response({
+            summary['name']: summary
+            for summary in summaries
+        })
+
+    def render_all_summaries(self):
+        return StreamingHttpResponse(
+            self.iter_all_summaries(),
+            content_type='application/x-ndjson')
+
+    def iter_all_summaries(self):
+        packages = PackageName.objects.filter(Q(source=True) | Q(pseudo=True))
+        packages = list(packages.order_by('name').values_list('id', 'name'))
+        for start in range(0, len(packages), self.BATCH_SIZE):
+            batch = packages[start:start + self.BATCH_SIZE]
+            for summary in _get_package_summaries(batch):
+                yield json.dumps(summary) + '\n'
+
+
 class CreateTeamView(LoginRequiredMixin, FormView):
     model = Team
     template_name = 'core/team-create.html'
@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_news_rendered_content'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PackageComparison',
+            fields=[
+                ('id', models.AutoField(verbose_name='ID', serialize=False, auto_created=True, primary_key=True)),
+                ('name', models.CharField(max_length=100)),
+                ('deriv_version', models.CharField(max_length=100, null=True)),
+                ('parent_version', models.CharField(max_length=100, null=True)),
+                ('category', models.CharField(max_length=20, choices=[('missing_pkg', 'Packages missing in the derivative'), ('new_pkg', 'Packages specific to the derivative'), ('newer_revision', 'Packages with newer Debian revision'), ('newer_version', 'Packages with newer upstream version'), ('older_revision', 'Packages with older Debian revision'), ('older_version', 'Packages with older upstream version')])),
+                ('relation', models.ForeignKey(related_name='package_comparisons', to='core.RepositoryRelation')),
+            ],
+        ),
+        migrations.AlterUniqueTogether(
+            name='packagecomparison',
+            unique_together=set([('relation', 'name')]),
+        ),
+        migrations.AlterIndexTogether(
+            name='packagecomparison',
+            index_together=set([('relation', 'category', 'name')]),
+        ),
+    ]
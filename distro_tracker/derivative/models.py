@@ -0,0 +1,109 @@
+# Copyright 2016 The Distro Tracker Developers
+# See the COPYRIGHT file at the top-level directory of this distribution and
+# at http://deb.li/DTAuthors
+#
+# This file is part of Distro Tracker. It is subject to the license terms
+# in the LICENSE file found in the top-level directory of this
+# distribution and at http://deb.li/DTLicense. No part of Distro Tracker,
+# including this file, may be copied, modified, propagated, or distributed
+# except according to the terms contained in the LICENSE file.
+"""
+Models for the :mod:`distro_tracker.derivative` app.
+"""
+from __future__ import unicode_literals
+
+from django.db import models
+from django.db import transaction
+from django.utils.encoding import python_2_unicode_compatible
+
+from distro_tracker.core.models import RepositoryRelation
+from distro_tracker.derivative.utils import compare_repositories
+from distro_tracker.derivative.utils import CATEGORIES_VERSION_COMPARISON
+
+
+class PackageComparisonManager(models.Manager):
+    """
+    A custom :class:`Manager <django.db.models.Manager>` for the
+    :class:`PackageComparison` model.
+    """
+    def update_for_relation(self, relation):
+        """
+        Compares the repositories of the given relation and stores the result,
+        only writing the rows which changed since the previous comparison.
+
+        :type relation: :class:`RepositoryRelation
+            <distro_tracker.core.models.RepositoryRelation>`
+        """
+        computed = {
+            pkg['name']: (pkg.get('deriv_version'), pkg.get('parent_version'),
+                          pkg['category'])
+            for pkg in compare_repositories(relation.repository,
+                                            relation.target_repository)
+        }
+        with transaction.atomic():
+            stored = {
+                name: (pk, (deriv_version, parent_version, category))
+                for pk, name, deriv_version, parent_version, category in
+                self.filter(relation=relation).values_list(
+                    'pk', 'name', 'deriv_version', 'parent_version',
+                    'category')
+            }
+            obsolete = [
+                pk for name, (pk, _) in stored.items()
+                if name not in computed
+            ]
+            self.filter(pk__in=obsolete).delete()
+
+            new = []
+            for name, values in computed.items():
+                deriv_version, parent_version, category = values
+                if name not in stored:
+                    new.append(PackageComparison(
+                        relation=relation,
+                        name=name,
+                        deriv_version=deriv_version,
+                        parent_version=parent_version,
+                        category=category))
+                elif stored[name][1] != values:
+                    self.filter(pk=stored[name][0]).update(
+                        deriv_version=deriv_version,
+                        parent_version=parent_version,
+                        category=category)
+            self.bulk_create(new)
+
+
+@python_2_unicode_compatible
+class PackageComparison(models.Model):
+    """
+    The version of a source package in a derivative repository compared to
+    its version in the parent repository.
+
+    Only packages whose versions differ are stored. The comparisons are
+    updated by the :class:`UpdatePackageComparisonsTask
+    <distro_tracker.derivative.tracker_tasks.UpdatePackageComparisonsTask>`
+    task.
+    """
+    relation = models.ForeignKey(RepositoryRelation,
+                                 related_name='package_comparisons')
+    name = models.CharField(max_length=100)
+    deriv_version = models.CharField(max_length=100, null=True)
+    parent_version = models.CharField(max_length=100, null=True)
+    category = models.CharField(
+        max_length=20, choices=sorted(CATEGORIES_VERSION_COMPARISON.items()))
+
+    objects = PackageComparisonManager()
+
+    class Meta:
+        unique_together = ('relation', 'name')
+        index_together = ('relation', 'category', 'name')
+
+    def __str__(self):
+        return "{}: {}".format(self.name, self.category)
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'deriv_version': self.deriv_version,
+            'parent_version': self.parent_version,
+            'category': self.category,
+        }
@@ -11,26 +11,42 @@
 Tests for the :mod:`distro_tracker.derivative` app.
 """
 
+import json
+
+from django.core.urlresolvers import reverse
+from django.utils.six.moves import mock
+
 from distro_tracker.test import TestCase
 
 from distro_tracker.core.models import Repository
 from distro_tracker.core.models import RepositoryRelation
 from distro_tracker.core.models import SourcePackageName
+from distro_tracker.core.tasks import Event, Job, JobState
+from distro_tracker.derivative.models import PackageComparison
+from distro_tracker.derivative.tracker_tasks import \
+    UpdatePackageComparisonsTask
 from distro_tracker.derivative.utils import compare_repositories
 from distro_tracker.derivative.utils import split_version
 from distro_tracker.derivative.utils import categorize_version_comparison
 
 
-class GenerateComparatingListTest(TestCase):
+class DerivativeRepositoriesMixin(object):
+    """
+    Creates a derivative repository and its parent with a few packages.
+    """
     def add_package(self, name, v1, v2):
         """Create package with v1 in derivative and v2 in parent."""
         pkgname = SourcePackageName.objects.create(name=name)
+        srcpkgs = {}
         for version, repo in ((v1, self.derivative_repo),
                               (v2, self.target_repo)):
             if not version:
                 continue
-            srcpkg = pkgname.source_package_versions.create(version=version)
-            srcpkg.repository_entries.create(repository=repo)
+            if version not in srcpkgs:
+                # The same version is shared by both repositories
+                srcpkgs[version] = pkgname.source_package_versions.create(
+                    version=version)
+            srcpkgs[version].repository_entries.create(repository=repo)
 
     def setUp(self):
         self.derivative_repo = Repository.objects.create(
@@ -49,6 +65,8 @@ class GenerateComparatingListTest(TestCase):
         self.add_package('pkg2', '1.0.0', '1.0.1')
         self.add_package('foopkg', '1.0.0', '1.0.1')
 
+
+class GenerateComparatingListTest(DerivativeRepositoriesMixin, TestCase):
     def test_compare_repositories_same_categories(self):
         # Test that the list is correctly sorted by package name as all packages
         # are in the same category
@@ -73,6 +91,171 @@ class GenerateComparatingListTest(TestCase):
         self.assertEqual(pkglist[4]['name'], 'foopkg2')
 
 
+class UpdatePackageComparisonsTaskTest(DerivativeRepositoriesMixin, TestCase):
+    """
+    Tests for the
+    :class:`distro_tracker.derivative.tracker_tasks.UpdatePackageComparisonsTask`
+    task.
+    """
+    def setUp(self):
+        super(UpdatePackageComparisonsTaskTest, self).setUp()
+        self.job_state = mock.create_autospec(JobState)
+        self.job_state.events_for_task.return_value = []
+        self.job = mock.create_autospec(Job)
+        self.job.job_state = self.job_state
+        self.task = UpdatePackageComparisonsTask()
+        self.task.job = self.job
+
+    def run_task(self, repository=None):
+        """
+        Runs the task, as the initial task of a job when no repository is
+        given or else as if a package of the repository had changed.
+        """
+        if repository is None:
+            self.job_state.processed_tasks = []
+            self.job_state.events_for_task.return_value = []
+        else:
+            self.job_state.processed_tasks = ['sometask']
+            self.job_state.events_for_task.return_value = [
+                Event(name='new-source-package-version-in-repository',
+                      arguments={'name': 'pkg', 'version': '1.0',
+                                 'repository': repository.name}),
+            ]
+        self.task.execute()
+
+    def get_stored(self):
+        return {
+            comparison.name: comparison.to_dict()
+            for comparison in PackageComparison.objects.all()
+        }
+
+    def test_stores_comparison(self):
+        self.add_package('samepkg', '1.0', '1.0')
+        self.add_package('newpkg', '1.0', None)
+
+        self.run_task()
+
+        stored = self.get_stored()
+        self.assertEqual(
+            ['foopkg', 'newpkg', 'pkg1', 'pkg2'], sorted(stored))
+        self.assertEqual({
+            'name': 'pkg1',
+            'deriv_version': '1.0.0',
+            'parent_version': '2.0.0',
+            'category': 'older_version',
+        }, stored['pkg1'])
+        self.assertEqual('new_pkg', stored['newpkg']['category'])
+        self.assertIsNone(stored['newpkg']['parent_version'])
+
+    def test_updates_changed_packages(self):
+        self.run_task()
+        # pkg1 is removed from the parent and foopkg upgraded in the
+        # derivative
+        self.target_repo.source_entries.filter(
+            source_package__source_package_name__name='pkg1').delete()
+        srcpkg = SourcePackageName.objects.get(
+            name='foopkg').source_package_versions.create(version='1.0.2')
+        self.derivative_repo.source_entries.filter(
+            source_package__source_package_name__name='foopkg').delete()
+        srcpkg.repository_entries.create(repository=self.derivative_repo)
+        # pkg2 is now in sync
+        self.derivative_repo.source_entries.filter(
+            source_package__source_package_name__name='pkg2').delete()
+        SourcePackageName.objects.get(
+            name='pkg2').source_package_versions.get(
+                version='1.0.1').repository_entries.create(
+                    repository=self.derivative_repo)
+
+        self.run_task(self.target_repo)
+
+        stored = self.get_stored()
+        self.assertEqual(['foopkg', 'pkg1'], sorted(stored))
+        self.assertEqual('new_pkg', stored['pkg1']['category'])
+        self.assertEqual('newer_version', stored['foopkg']['category'])
+        self.assertEqual('1.0.2', stored['foopkg']['deriv_version'])
+
+    def test_unrelated_repository_not_compared(self):
+        other_repo = Repository.objects.create(
+            name='other_repo', shorthand='other_repo',
+            codename='other_codename', suite='other_suite')
+
+        self.run_task(other_repo)
+
+        self.assertEqual(0, PackageComparison.objects.count())
+
+
+class ComparisonViewTest(DerivativeRepositoriesMixin, TestCase):
+    """
+    Tests for the views displaying the stored comparison of a derivative.
+    """
+    def setUp(self):
+        super(ComparisonViewTest, self).setUp()
+        self.add_package('newpkg', '1.0', None)
+        PackageComparison.objects.update_for_relation(self.relation)
+
+    def test_comparison_page(self):
+        response = self.client.get(
+            reverse('dtracker-derivative-comparison',
+                    args=[self.derivative_repo.shorthand]))
+
+        # The most important category is displayed by default
+        self.assertEqual('older_version', response.context['category'])
+        self.assertEqual(
+            ['foopkg', 'pkg1', 'pkg2'],
+            [pkg.name for pkg in response.context['pkglist']])
+        self.assertEqual([
+            ('older_version', 'Packages with older upstream version', 3),
+            ('new_pkg', 'Packages specific to the derivative', 1),
+        ], response.context['category_counts'])
+
+    def test_comparison_page_category(self):
+        response = self.client.get(
+            reverse('dtracker-derivative-comparison',
+                    args=[self.derivative_repo.shorthand]),
+            {'category': 'new_pkg'})
+
+        self.assertEqual(
+            ['newpkg'], [pkg.name for pkg in response.context['pkglist']])
+
+    def test_comparison_page_paginated(self):
+        with mock.patch('distro_tracker.derivative.views.PACKAGES_PER_PAGE',
+                        2):
+            response = self.client.get(
+                reverse('dtracker-derivative-comparison',
+                        args=[self.derivative_repo.shorthand]),
+                {'page': 2})
+
+        self.assertEqual(
+            ['pkg2'], [pkg.name for pkg in response.context['pkglist']])
+
+    def test_comparison_json(self):
+        url = reverse('dtracker-derivative-comparison-json',
+                      args=[self.derivative_repo.shorthand])
+
+        response = self.client.get(url)
+
+        content = json.loads(response.content.decode('utf-8'))
+        self.assertEqual('derivative_repo', content['repository'])
+        self.assertEqual('target_repo', content['target_repository'])
+        self.assertEqual(
+            ['foopkg', 'pkg1', 'pkg2', 'newpkg'],
+            [pkg['name'] for pkg in content['packages']])
+
+        response = self.client.get(url, {'category': 'new_pkg'})
+        content = json.loads(response.content.decode('utf-8'))
+        self.assertEqual([{
+            'name': 'newpkg',
+            'deriv_version': '1.0',
+            'parent_version': None,
+            'category': 'new_pkg',
+        }], content['packages'])
+
+        response = self.client.get(url, {'category': '<b>unknown</b>'})
+        self.assertEqual(400, response.status_code)
+        self.assertEqual('text/plain', response['Content-Type'])
+        self.assertNotIn(b'unknown', response.content)
+
+
 class CategorizeVersionComparisonTest(TestCase):
     def test_version_equal(self):
         a = '2.1.0-1'
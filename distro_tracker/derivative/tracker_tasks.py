@@ -0,0 +1,51 @@
+# Copyright 2016 The Distro Tracker Developers
+# See the COPYRIGHT file at the top-level directory of this distribution and
+# at http://deb.li/DTAuthors
+#
+# This file is part of Distro Tracker. It is subject to the license terms
+# in the LICENSE file found in the top-level directory of this
+# distribution and at http://deb.li/DTLicense. No part of Distro Tracker,
+# including this file, may be copied, modified, propagated, or distributed
+# except according to the terms contained in the LICENSE file.
+"""
+Distro Tracker tasks for the :mod:`distro_tracker.derivative` app.
+"""
+from __future__ import unicode_literals
+
+from django.db.models import Q
+
+from distro_tracker.core.models import RepositoryRelation
+from distro_tracker.core.tasks import BaseTask
+from distro_tracker.derivative.models import PackageComparison
+
+
+class UpdatePackageComparisonsTask(BaseTask):
+    """
+    Compares the source packages of derivative repositories with the ones of
+    their parent repository.
+
+    When ran as part of a job, only the relations involving a repository whose
+    content changed are updated.
+    """
+    DEPENDS_ON_EVENTS = (
+        'new-source-package-version-in-repository',
+        'lost-source-package-version-in-repository',
+    )
+
+    def execute(self):
+        relations = RepositoryRelation.objects.filter(name='derivative')
+        relations = relations.select_related('repository',
+                                             'target_repository')
+        if not self.is_initial_task():
+            repositories = set(
+                event.arguments['repository']
+                for event in self.get_all_events()
+            )
+            if not repositories:
+                return
+            relations = relations.filter(
+                Q(repository__name__in=repositories) |
+                Q(target_repository__name__in=repositories))
+
+        for relation in relations:
+            PackageComparison.objects.update_for_relation(relation)
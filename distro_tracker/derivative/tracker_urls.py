@@ -12,12 +12,14 @@ from __future__ import unicode_literals
 
 from django.conf.urls import url
 
-from .views import index, comparison
+from .views import index, comparison, comparison_json
 
 urlpatterns = [
     url('^derivative/$', index, name='dtracker-derivative-index'),
     url('^derivative/(?P<distribution>[^/]+)/$', comparison,
         name='dtracker-derivative-comparison'),
+    url('^api/derivative/(?P<distribution>[^/]+)/$', comparison_json,
+        name='dtracker-derivative-comparison-json'),
 ]
 
 frontpagelinks = [
@@ -8,12 +8,19 @@
 # including this file, may be copied, modified, propagated, or distributed
 # except according to the terms contained in the LICENSE file.
 
+from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
+from django.db.models import Count
+from django.http import HttpResponseBadRequest
 from django.shortcuts import render
 from django.shortcuts import get_list_or_404, get_object_or_404
 
 from distro_tracker.core.models import RepositoryRelation
 from distro_tracker.core.models import Repository
-from .utils import compare_repositories, CATEGORIES_VERSION_COMPARISON
+from distro_tracker.core.utils import render_to_json_response
+from .utils import CATEGORIES_VERSION_COMPARISON, CATEGORIES_PRIORITY
+
+#: The number of packages displayed on a page of the comparison
+PACKAGES_PER_PAGE = 100
 
 
 def index(request):
@@ -22,14 +29,79 @@ def index(request):
                   {'list_derivatives': list_derivatives})
 
 
-def comparison(request, distribution):
+def _get_relation(distribution):
     repository = get_object_or_404(Repository, shorthand=distribution)
-    relation = get_object_or_404(repository.relations, name='derivative')
-    pkglist = compare_repositories(repository, relation.target_repository)
+    return get_object_or_404(
+        repository.relations.select_related('repository',
+                                            'target_repository'),
+        name='derivative')
+
+
+def _get_category_counts(relation):
+    """
+    :returns: A list of ``(category, description, count)`` tuples for the
+        categories of the stored comparison, ordered by priority.
+    """
+    counts = relation.package_comparisons.values('category').annotate(
+        count=Count('pk'))
+    counts = {row['category']: row['count'] for row in counts}
+    return [
+        (category, CATEGORIES_VERSION_COMPARISON[category], counts[category])
+        for category in sorted(counts, key=CATEGORIES_PRIORITY.get)
+    ]
+
+
+def comparison(request, distribution):
+    relation = _get_relation(distribution)
+    category_counts = _get_category_counts(relation)
+
+    # Show the most important category by default
+    category = request.GET.get('category')
+    if category not in CATEGORIES_VERSION_COMPARISON and category_counts:
+        category = category_counts[0][0]
+
+    packages = relation.package_comparisons.filter(category=category)
+    paginator = Paginator(packages.order_by('name'), PACKAGES_PER_PAGE)
+    try:
+        page = paginator.page(request.GET.get('page'))
+    except PageNotAnInteger:
+        page = paginator.page(1)
+    except EmptyPage:
+        page = paginator.page(paginator.num_pages)
+
     context = {
-        'pkglist': pkglist,
+        'category_counts': category_counts,
+        'category': category,
         'categories': CATEGORIES_VERSION_COMPARISON,
-        'repository': repository,
+        'page_obj': page,
+        'pkglist': page.object_list,
+        'repository': relation.repository,
         'target_repository': relation.target_repository,
     }
     return render(request, 'derivative/comparison.html', context)
+
+
+def comparison_json(request, distribution):
+    """
+    Returns the comparison of the derivative with its parent repository as
+    JSON. The ``category`` query parameter restricts the packages to a single
+    category.
+    """
+    relation = _get_relation(distribution)
+    packages = relation.package_comparisons.all()
+    category = request.GET.get('category')
+    if category:
+        if category not in CATEGORIES_VERSION_COMPARISON:
+            return HttpResponseBadRequest(
+                'Unknown category', content_type='text/plain')
+        packages = packages.filter(category=category)
+
+    packages = sorted(
+        packages.values('name', 'deriv_version', 'parent_version',
+                        'category').iterator(),
+        key=lambda pkg: (CATEGORIES_PRIORITY[pkg['category']], pkg['name']))
+    return render_to_json_response({
+        'repository': relation.repository.shorthand,
+        'target_repository': relation.target_repository.shorthand,
+        'packages': packages,
+    })
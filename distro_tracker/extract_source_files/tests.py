@@ -103,6 +103,32 @@ class ExtractSourcePackageFilesTest(TestCase):
             extracted_file = ExtractedSourceFile.objects.all()[0]
             self.assertEqual('changelog', extracted_file.name)
 
+    @mock.patch('distro_tracker.extract_source_files.tracker_tasks.'
+                'AptCache.retrieve_source')
+    def test_create_extracted_files_marks_package_modified(self, mock_cache):
+        """
+        Tests that the package is marked as modified when files are extracted
+        for it.
+        """
+        name = SourcePackageName.objects.create(name='dummy-package')
+        package = SourcePackage.objects.create(
+            source_package_name=name, version='1.0.0')
+        self.add_mock_event('new-source-package-version', {
+            'pk': package.pk,
+        })
+
+        with make_temp_directory('dtracker-pkg-dir') as pkg_directory:
+            debian_dir = os.path.join(pkg_directory, 'debian')
+            os.makedirs(debian_dir)
+            with open(os.path.join(debian_dir, 'changelog'), 'w') as f:
+                f.write('Contents')
+            mock_cache.return_value = pkg_directory
+
+            self.run_task()
+
+        name = SourcePackageName.objects.get(pk=name.pk)
+        self.assertIsNotNone(name.last_modified)
+
     @mock.patch('distro_tracker.extract_source_files.tracker_tasks.'
                 'AptCache.retrieve_source')
     def test_create_extracted_files_only_wanted_files(self, mock_cache):
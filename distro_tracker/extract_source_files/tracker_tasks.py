@@ -15,6 +15,7 @@ from __future__ import unicode_literals
 from distro_tracker.core.tasks import BaseTask
 from distro_tracker.core.utils.packages import AptCache
 from distro_tracker.core.models import ExtractedSourceFile
+from distro_tracker.core.models import PackageName
 from distro_tracker.core.models import SourcePackage
 from django.core.files import File
 
@@ -76,6 +77,7 @@ class ExtractSourcePackageFiles(BaseTask):
         if files_to_extract is None:
             files_to_extract = self.ALL_FILES_TO_EXTRACT
 
+        extracted = False
         for file_name in files_to_extract:
             file_path = os.path.join(debian_directory, file_name)
             if not os.path.exists(file_path):
@@ -86,6 +88,12 @@ class ExtractSourcePackageFiles(BaseTask):
                     source_package=source_package,
                     extracted_file=extracted_file,
                     name=file_name)
+            extracted = True
+
+        if extracted:
+            # The links to the extracted files are displayed on the page
+            PackageName.objects.mark_modified(
+                [source_package.source_package_name_id])
 
     def _execute_initial(self):
         """
@@ -97,7 +105,10 @@ class ExtractSourcePackageFiles(BaseTask):
         # First remove all source files which are no longer to be included.
         qs = ExtractedSourceFile.objects.exclude(
             name__in=self.ALL_FILES_TO_EXTRACT)
+        modified = set(qs.values_list(
+            'source_package__source_package_name', flat=True))
         qs.delete()
+        PackageName.objects.mark_modified(modified)
 
         # Retrieves the packages and all the associated files with each of them
         # in only two db queries.
@@ -378,6 +378,12 @@ DISTRO_TRACKER_NEWS_PANEL_LIMIT = 30
 #: The maximum number of RSS news items to include in the news feed
 DISTRO_TRACKER_RSS_ITEM_LIMIT = 30
 
+#: The number of seconds during which the rendered output of a package page
+#: panel is kept in the cache. Cached panels are invalidated as soon as the
+#: package data changes, this is only an upper bound. Set to 0 to disable
+#: the cache.
+DISTRO_TRACKER_PANELS_CACHE_TIMEOUT = 3600
+
 #: A list of extra headers to include when rendering an email news item.
 #: See: :class:`distro_tracker.core.models.EmailNewsRenderer`
 DISTRO_TRACKER_EMAIL_NEWS_HEADERS = (
@@ -27,6 +27,7 @@ from distro_tracker.core.views import PackageSearchView, PackageAutocompleteView
 from distro_tracker.core.views import OpenSearchDescription
 from distro_tracker.core.views import ActionItemJsonView, ActionItemView
 from distro_tracker.core.views import KeywordsView
+from distro_tracker.core.views import PackageSummariesView
 from distro_tracker.core.views import CreateTeamView
 from distro_tracker.core.views import TeamDetailsView
 from distro_tracker.core.views import DeleteTeamView
@@ -95,6 +96,8 @@ urlpatterns = [
         name='dtracker-api-action-item'),
     url(r'^api/keywords/$', KeywordsView.as_view(),
         name='dtracker-api-keywords'),
+    url(r'^api/packages/summaries/$', PackageSummariesView.as_view(),
+        name='dtracker-api-package-summaries'),
 
     url(r'^admin/', include(admin.site.urls)),
 
@@ -15,6 +15,8 @@ Tests for the :mod:`distro_tracker.stdver_warnings` app.
 
 from __future__ import unicode_literals
 from distro_tracker.test import TestCase
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.utils.six.moves import mock
 from distro_tracker.stdver_warnings.tracker_tasks \
     import UpdateStandardsVersionWarnings
@@ -310,3 +312,34 @@ class StandardsVersionActionItemTests(TestCase):
         self.assertEqual(2, ActionItem.objects.count())
         self.assertEqual(1, outdated_package_name.action_items.count())
         self.assertEqual(1, self.package_name.action_items.count())
+
+    def test_task_query_count(self):
+        """
+        Tests that the number of queries of the task does not grow with the
+        number of packages it checks.
+        """
+        self.set_debian_policy_version('3.9.4.0')
+        action_type = self.get_action_type()
+        for i in range(1000):
+            package_name = SourcePackageName.objects.create(
+                name='package{}'.format(i))
+            package = SourcePackage.objects.create(
+                source_package_name=package_name,
+                version='1.0.0',
+                standards_version='3.9.{}'.format(i % 5))
+            package_name.main_source_version = package
+            package_name.save()
+            if i % 2:
+                ActionItem.objects.create(
+                    package=package_name,
+                    item_type=action_type,
+                    short_description='Desc')
+
+        with CaptureQueriesContext(connection) as queries:
+            self.run_task(initial_task=True)
+
+        # Packages with a Standards-Version older than 3.9.4 have an item
+        items = ActionItem.objects.filter(
+            item_type=action_type, package__name__startswith='package')
+        self.assertEqual(800, items.count())
+        self.assertLessEqual(len(queries), 40)
@@ -56,8 +56,7 @@ class UpdateStandardsVersionWarnings(BaseTask):
             for event in self.get_all_events()
         ]
         qs = SourcePackageName.objects.filter(
-            source_package_versions__pk__in=package_pks)
-        qs.prefetch_related('action_items')
+            source_package_versions__pk__in=package_pks).distinct()
 
         return qs
 
@@ -74,49 +73,41 @@ class UpdateStandardsVersionWarnings(BaseTask):
 
         return policy_version
 
-    def create_action_item(self, package, policy_version):
+    def get_action_item_state(self, package, policy_version):
         """
-        Creates a :class:`distro_tracker.core.models.ActionItem` instance if the
-        Standards-Version of the given package is outdated when compared to the
-        given policy version.
+        Computes the :class:`distro_tracker.core.models.ActionItem` of the
+        given package, which exists only if its Standards-Version is outdated
+        when compared to the given policy version.
+
+        :returns: A ``(severity, short_description, extra_data)`` tuple, as
+            expected by :meth:`ActionItemManager.reconcile
+            <distro_tracker.core.models.ActionItemManager.reconcile>`, or
+            ``None`` if the Standards-Version is up to date.
         """
-        if not package.main_version:
-            return
-        # Get the old action item entry
-        action_item = package.get_action_item_for_type(self.ACTION_ITEM_TYPE)
         standards_version = package.main_version.standards_version
         if standards_version.startswith(policy_version):
             # The std-ver of the package is up to date.
-            # Remove any possibly existing action item.
-            if action_item is not None:
-                action_item.delete()
             return
 
         major_policy_version_number, _ = policy_version.split('.', 1)
         severely_outdated = not standards_version.startswith(
             major_policy_version_number)
 
-        if action_item is None:
-            action_item = ActionItem(
-                package=package,
-                item_type=self.action_type)
-
         # Remove the minor patch level from the package's Std-Ver, if it has it
         if standards_version.count('.') == 3:
             standards_version, _ = standards_version.rsplit('.', 1)
 
         if severely_outdated:
-            action_item.severity = ActionItem.SEVERITY_HIGH
+            severity = ActionItem.SEVERITY_HIGH
         else:
-            action_item.severity = ActionItem.SEVERITY_WISHLIST
+            severity = ActionItem.SEVERITY_WISHLIST
 
-        action_item.short_description = self.ITEM_DESCRIPTION
-        action_item.extra_data = {
+        extra_data = {
             'lastsv': policy_version,
             'standards_version': standards_version,
             'severely_outdated': severely_outdated,
         }
-        action_item.save()
+        return severity, self.ITEM_DESCRIPTION, extra_data
 
     def execute(self):
         # Get the current policy version
@@ -128,11 +119,22 @@ class UpdateStandardsVersionWarnings(BaseTask):
         if self.is_initial_task():
             # If the task is directly ran, update all packages
             packages = SourcePackageName.objects.all()
-            packages.prefetch_related('action_items')
         else:
             # If the task is ran as part of a job, get the packages from raised
             # events
             packages = self.get_packages_from_events()
-
-        for package in packages:
-            self.create_action_item(package, policy_version)
+        packages = packages.select_related('main_source_version')
+
+        checked_packages = []
+        items = {}
+        for package in packages.iterator():
+            if not package.main_version:
+                # Keep the item of packages without any version as is
+                continue
+            checked_packages.append(package.name)
+            state = self.get_action_item_state(package, policy_version)
+            if state:
+                items[package.name] = state
+
+        ActionItem.objects.reconcile(self.action_type, items,
+                                     package_names=checked_packages)
@@ -105,4 +105,5 @@ def set_mock_response(mock_requests, text="", headers=None, status_code=200):
     mock_response.text = text
     mock_response.content = text.encode('utf-8')
     mock_response.iter_lines.return_value = text.splitlines()
+    mock_response.iter_content.return_value = [text.encode('utf-8')]
     mock_requests.get.return_value = mock_response